@@ -11,6 +11,15 @@ import numpy as np
 from pathlib import Path
 from scipy.signal import find_peaks
 
+# Optional: newer servers write zstd frames (identified by magic prefix)
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+_BIN_MAGIC = b'TWB1'  # binary buffers: uint32 count, f8 timestamps, f4 channels
+
 DB_PATH = Path.home() / "Downloads/SensorDownload/Current/AppleWatch/direct_download/tennis_watch.db"
 
 def analyze_latest_session():
@@ -49,8 +58,33 @@ def analyze_latest_session():
     # Parse all samples
     all_samples = []
     for (compressed_data,) in buffers:
-        # Not compressed in this version
-        csv_data = compressed_data.decode('utf-8')
+        # Decode by codec: zstd frames carry a magic prefix, gzip rows come
+        # from older servers, anything else is raw payload
+        if zstd is not None and compressed_data[:4] == _ZSTD_MAGIC:
+            raw = zstd.ZstdDecompressor().decompress(compressed_data)
+        else:
+            try:
+                raw = gzip.decompress(compressed_data)
+            except (gzip.BadGzipFile, OSError):
+                raw = compressed_data
+
+        # Binary buffers (newer servers): f8 timestamps + f4 channels
+        # (rotX/rotY/rotZ are channels 0-2)
+        if raw[:4] == _BIN_MAGIC:
+            n = int(np.frombuffer(raw, dtype='<u4', count=1, offset=4)[0])
+            ts = np.frombuffer(raw, dtype='<f8', count=n, offset=8)
+            ch = np.frombuffer(raw, dtype='<f4', count=n * 13,
+                               offset=8 + 8 * n).reshape(n, 13)
+            for t, row in zip(ts.tolist(), ch.tolist()):
+                all_samples.append({
+                    't': t,
+                    'rx': row[0],
+                    'ry': row[1],
+                    'rz': row[2],
+                })
+            continue
+
+        csv_data = raw.decode('utf-8')
         reader = csv.DictReader(io.StringIO(csv_data))
 
         for row in reader:
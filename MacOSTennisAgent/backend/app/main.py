@@ -9,13 +9,51 @@ from contextlib import asynccontextmanager
 import json
 import asyncio
 import sqlite3
+import threading
 import gzip
 import uuid
+import numpy as np
+from operator import itemgetter
 from typing import Dict, List
 from datetime import datetime
 from pathlib import Path
 
-from app.services.swing_detector import SwingDetector, SensorSample, estimate_swing_speed
+# orjson is optional: 3-10x faster than stdlib json for the per-message and
+# per-shot (de)serialization on the hot path
+try:
+    import orjson
+    # ORJSONResponse asserts orjson at render time, so only pick it when
+    # the import above succeeded
+    from fastapi.responses import ORJSONResponse as _ResponseClass
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    def _json_dumps_bytes(obj) -> bytes:
+        # OPT_SERIALIZE_NUMPY: peak magnitudes arrive as NumPy scalars
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    _json_loads = orjson.loads
+except ImportError:
+    from fastapi.responses import JSONResponse as _ResponseClass
+
+    _json_dumps = json.dumps
+
+    def _json_dumps_bytes(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    _json_loads = json.loads
+
+# zstandard is optional: 3-5x faster than gzip at a similar ratio on sensor
+# CSV. Without it the ingest path falls back to fast (level 1) gzip.
+try:
+    import zstandard as zstd
+    _ZSTD_COMPRESSOR = zstd.ZstdCompressor(level=3)
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+from app.services.swing_detector import SwingDetector, estimate_swing_speeds
 from app.models.sensor_data import (
     SensorBatchMessage,
     SwingDetectedMessage,
@@ -43,22 +81,243 @@ ENABLE_REALTIME_SWING_DETECTION = True
 # Note: With real-time detection disabled, you can still analyze sessions
 # offline using Python scripts that read from raw_sensor_buffer table
 
+# Cap for a coalesced swing frame; stays within a typical TCP window so a
+# burst notification never stalls behind its own size
+_WS_FRAME_MAX_BYTES = 25_000
+
+# Inbound frame queue between the socket reader and the processor. Bounded
+# with drop-oldest: if processing falls behind, fresh sensor data beats
+# stale, and memory stays flat. The client is asked to downsample when the
+# queue runs hot (80%), cleared once it drains back to a quarter.
+_WS_RECV_QUEUE_MAX = 64
+_WS_BACKPRESSURE_AT = int(_WS_RECV_QUEUE_MAX * 0.8)
+
 
 # ============================================================================
 # Database Helper Functions
 # ============================================================================
 
+# Hot-path SQL hoisted to module constants: sqlite3 caches prepared statements
+# per connection keyed by the SQL text, so a stable string means each
+# statement is parsed and planned once for the life of the connection
+_SQL_INSERT_SESSION = """
+    INSERT INTO sessions (
+        session_id, device, date, start_time, data_json
+    ) VALUES (?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_SHOT = """
+    INSERT INTO shots (
+        shot_id, session_id, timestamp, sequence_number,
+        rotation_magnitude, acceleration_magnitude,
+        speed_mph, data_json
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_BUFFER = """
+    INSERT OR IGNORE INTO raw_sensor_buffer (
+        buffer_id, session_id, start_timestamp, end_timestamp,
+        sample_count, compressed_data
+    ) VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_UPDATE_SESSION_END = """
+    UPDATE sessions
+    SET end_time = ?,
+        duration_minutes = ?,
+        shot_count = ?,
+        updated_at = strftime('%s', 'now')
+    WHERE session_id = ?
+"""
+
+# REST read statements, hoisted for the same statement-cache stability as
+# the insert SQL above: a stable string means sqlite3 reuses the prepared
+# statement across requests on the shared connection
+_SQL_LIST_SESSIONS = """
+    SELECT
+        session_id,
+        device,
+        date,
+        datetime(start_time, 'unixepoch') as start_datetime,
+        datetime(end_time, 'unixepoch') as end_datetime,
+        duration_minutes,
+        shot_count
+    FROM sessions
+    ORDER BY start_time DESC
+    LIMIT ?
+"""
+
+_SQL_GET_SESSION = """
+    SELECT
+        session_id,
+        device,
+        date,
+        datetime(start_time, 'unixepoch') as start_datetime,
+        datetime(end_time, 'unixepoch') as end_datetime,
+        duration_minutes,
+        shot_count
+    FROM sessions
+    WHERE session_id = ?
+"""
+
+_SQL_SESSION_SHOTS = """
+    SELECT
+        shot_id,
+        timestamp,
+        sequence_number,
+        rotation_magnitude,
+        acceleration_magnitude,
+        speed_mph
+    FROM shots
+    WHERE session_id = ?
+    ORDER BY sequence_number
+"""
+
+_SQL_SWINGS_BY_SESSION = """
+    SELECT
+        shot_id,
+        session_id,
+        timestamp,
+        sequence_number,
+        rotation_magnitude,
+        acceleration_magnitude,
+        speed_mph,
+        datetime(timestamp, 'unixepoch') as shot_datetime
+    FROM shots
+    WHERE session_id = ?
+    ORDER BY sequence_number
+    LIMIT ?
+"""
+
+# Response keys for /api/swings rows, in SELECT column order
+_SWING_COLS = (
+    "shot_id", "session_id", "timestamp", "sequence_number",
+    "rotation_magnitude", "acceleration_magnitude", "speed_mph",
+    "shot_datetime"
+)
+
+_SQL_SWINGS_RECENT = """
+    SELECT
+        shot_id,
+        session_id,
+        timestamp,
+        sequence_number,
+        rotation_magnitude,
+        acceleration_magnitude,
+        speed_mph,
+        datetime(timestamp, 'unixepoch') as shot_datetime
+    FROM shots
+    ORDER BY timestamp DESC
+    LIMIT ?
+"""
+
+# Magic prefix for binary sensor-buffer payloads (v1): 4-byte tag,
+# uint32 sample count, float64 timestamps[N], float32 channels[N][13].
+# Rows without the prefix are legacy CSV text.
+_BINARY_BUFFER_MAGIC = b'TWB1'
+
+# One C-level extractor for the 14 wire fields in canonical column order
+# (timestamp, rot, acc, grav, quat - the binary buffer channel order);
+# map(_SAMPLE_FIELDS, samples) replaces a per-sample tuple comprehension
+# with 14 dict subscripts each
+_SAMPLE_FIELDS = itemgetter(
+    'timestamp',
+    'rotationRateX', 'rotationRateY', 'rotationRateZ',
+    'accelerationX', 'accelerationY', 'accelerationZ',
+    'gravityX', 'gravityY', 'gravityZ',
+    'quaternionW', 'quaternionX', 'quaternionY', 'quaternionZ'
+)
+
+# Singleton connection, opened at lifespan startup. Opening per call paid
+# file-open + journal-setup + PRAGMA parsing on every insert; reusing one
+# connection eliminates that, and WAL + synchronous=NORMAL cuts the fsync
+# per commit down to a WAL append.
+_db_conn: sqlite3.Connection = None
+
+# Whether the unique buffer index backs INSERT OR IGNORE dedup; when the
+# index can't be built, insert_raw_sensor_buffer falls back to an explicit
+# duplicate probe
+_buffer_dedup_indexed = False
+
+
 def get_db_connection():
     """
-    Get a database connection with proper configuration.
+    Get the shared database connection, opening and tuning it on first use.
 
     Returns:
         sqlite3.Connection: Configured database connection
     """
-    conn = sqlite3.connect(str(database_path))
-    conn.row_factory = sqlite3.Row  # Enable dict-like access to rows
-    conn.execute("PRAGMA foreign_keys = ON")  # Enable foreign key constraints
-    return conn
+    global _db_conn
+    if _db_conn is None:
+        conn = sqlite3.connect(
+            str(database_path),
+            check_same_thread=False,
+            cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row  # Enable dict-like access to rows
+        conn.execute("PRAGMA foreign_keys = ON")  # Enable foreign key constraints
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        conn.execute("PRAGMA cache_size=-65536")    # 64 MB page cache
+
+        # Dedup guard for raw buffers: backs the INSERT OR IGNORE in
+        # insert_raw_sensor_buffer, replacing a SELECT-then-INSERT round
+        # trip. Databases predating the v2.6 dedup can already hold
+        # duplicate rows - exactly the data the dedup was added for - which
+        # would make the CREATE UNIQUE INDEX raise IntegrityError, so
+        # collapse them first (keeping the oldest row of each group)
+        global _buffer_dedup_indexed
+        try:
+            conn.execute("""
+                DELETE FROM raw_sensor_buffer WHERE rowid NOT IN (
+                    SELECT MIN(rowid) FROM raw_sensor_buffer
+                    GROUP BY session_id, start_timestamp, end_timestamp
+                )
+            """)
+            conn.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_buffer_unique
+                ON raw_sensor_buffer(session_id, start_timestamp, end_timestamp)
+            """)
+            conn.commit()
+            _buffer_dedup_indexed = True
+        except sqlite3.DatabaseError:
+            # Fresh database without the schema yet (init_database creates
+            # it), or an index build that still failed; the explicit probe
+            # in insert_raw_sensor_buffer keeps deduplicating either way
+            _buffer_dedup_indexed = False
+
+        _db_conn = conn
+    return _db_conn
+
+
+def close_db_connection():
+    """Close the shared connection (shutdown only)."""
+    global _db_conn
+    if _db_conn is not None:
+        # Leave fresh planner statistics behind for the next run;
+        # analysis_limit bounds the row scan so shutdown stays quick
+        try:
+            _db_conn.execute("PRAGMA analysis_limit=400")
+            _db_conn.execute("PRAGMA optimize")
+        except sqlite3.Error as e:
+            print(f"⚠️  PRAGMA optimize failed on shutdown: {e}")
+        _db_conn.close()
+        _db_conn = None
+
+
+async def _pragma_optimize_loop():
+    """Background task: refresh planner statistics once a day."""
+    while True:
+        await asyncio.sleep(24 * 3600)
+        try:
+            conn = get_db_connection()
+            conn.execute("PRAGMA analysis_limit=1000")
+            conn.execute("PRAGMA optimize")
+            print("🧹 Refreshed query planner statistics (PRAGMA optimize)")
+        except Exception as e:
+            print(f"❌ Error running PRAGMA optimize: {e}")
 
 
 def insert_session(session_id: str, device: str, start_time: float):
@@ -78,31 +337,39 @@ def insert_session(session_id: str, device: str, start_time: float):
         date = datetime.fromtimestamp(start_time).strftime('%Y-%m-%d')
 
         # Prepare metadata
-        data_json = json.dumps({
+        data_json = _json_dumps({
             "device": device,
             "start_time": start_time
         })
 
-        cursor.execute("""
-            INSERT INTO sessions (
-                session_id, device, date, start_time, data_json
-            ) VALUES (?, ?, ?, ?, ?)
-        """, (session_id, device, date, int(start_time), data_json))
+        cursor.execute(_SQL_INSERT_SESSION,
+                       (session_id, device, date, int(start_time), data_json))
 
-        conn.commit()
-        conn.close()
-        print(f"💾 Saved session to database: {session_id}")
+        # No commit here: the row rides along with the session's first
+        # buffer/shot flush (or the background flush loop's guard commit),
+        # keeping the fsync out of the message-handling path. The session
+        # lifecycle is closed by the COMMIT in update_session_end.
+        print(f"💾 Queued session for database: {session_id}")
 
     except Exception as e:
         print(f"❌ Error saving session to database: {e}")
 
 
+# Shot write batching: a per-shot INSERT + commit costs one fsync per swing.
+# Shots are appended to this buffer and flushed via executemany + a single
+# commit, either when the buffer fills or on the periodic background flush.
+_shot_buffer: List[tuple] = []
+_shot_buffer_lock = threading.Lock()
+_SHOT_FLUSH_MAX = 64          # flush immediately at this many pending shots
+_SHOT_FLUSH_INTERVAL = 0.5    # seconds between background flushes
+
+
 def insert_shot(shot_id: str, session_id: str, timestamp: float,
                 sequence_number: int, rotation_magnitude: float,
                 acceleration_magnitude: float, speed_mph: float,
                 sensor_data: dict):
     """
-    Insert a detected shot/swing into the database.
+    Queue a detected shot/swing for batched insertion.
 
     Args:
         shot_id: Shot identifier
@@ -114,40 +381,73 @@ def insert_shot(shot_id: str, session_id: str, timestamp: float,
         speed_mph: Estimated speed (mph)
         sensor_data: Full sensor readings at peak
     """
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Prepare sensor data JSON
-        data_json = json.dumps(sensor_data)
-
-        cursor.execute("""
-            INSERT INTO shots (
-                shot_id, session_id, timestamp, sequence_number,
-                rotation_magnitude, acceleration_magnitude,
-                speed_mph, data_json
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+    with _shot_buffer_lock:
+        _shot_buffer.append((
             shot_id, session_id, timestamp, sequence_number,
             rotation_magnitude, acceleration_magnitude,
-            speed_mph, data_json
+            speed_mph, _json_dumps(sensor_data)
         ))
+        flush_now = len(_shot_buffer) >= _SHOT_FLUSH_MAX
+
+    if flush_now:
+        flush_shot_buffer()
+
+
+def flush_shot_buffer():
+    """Write all pending shots in one transaction."""
+    # Take ownership of the pending rows under the lock: the periodic flush
+    # loop (worker thread via asyncio.to_thread) and the DB writer thread
+    # (via insert_shot / update_session_end) can both call this, and two
+    # concurrent flushes over the same slice would executemany the same
+    # shot_ids twice and then delete rows the loser never wrote
+    with _shot_buffer_lock:
+        if not _shot_buffer:
+            return
+        rows = _shot_buffer[:]
+        del _shot_buffer[:len(rows)]
 
+    try:
+        conn = get_db_connection()
+        conn.executemany(_SQL_INSERT_SHOT, rows)
         conn.commit()
-        conn.close()
-        print(f"💾 Saved shot to database: {shot_id}")
+        print(f"💾 Saved {len(rows)} shot(s) to database")
 
     except Exception as e:
-        print(f"❌ Error saving shot to database: {e}")
+        print(f"❌ Error saving shots to database: {e}")
+
+
+def _flush_and_commit():
+    """Flush pending shots, then close any transaction left open."""
+    flush_shot_buffer()
+
+    # Guard commit: close any transaction still open (e.g. a
+    # session_start with no sensor data yet) so a crash loses at most
+    # one flush interval of work
+    conn = _db_conn
+    if conn is not None and conn.in_transaction:
+        try:
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️  Background commit failed: {e}")
+
+
+async def _shot_flush_loop():
+    """Background task: flush pending shots every _SHOT_FLUSH_INTERVAL."""
+    while True:
+        await asyncio.sleep(_SHOT_FLUSH_INTERVAL)
+        await asyncio.to_thread(_flush_and_commit)
 
 
 def insert_raw_sensor_buffer(session_id: str, samples: List[dict]):
     """
     Insert raw sensor data into buffer table for debugging/reprocessing.
-    Data is compressed with gzip to save space.
+    Data is compressed to save space.
 
     v2.6: Added duplicate prevention to avoid storing same timestamp range multiple times.
 
+    Array packing, compression, and the SQLite write are all blocking work;
+    this runs on the DB writer thread, never on the event loop.
+
     Args:
         session_id: Parent session ID
         samples: List of sensor sample dictionaries
@@ -159,54 +459,67 @@ def insert_raw_sensor_buffer(session_id: str, samples: List[dict]):
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        # Extract timestamp range
-        start_timestamp = min(s['timestamp'] for s in samples)
-        end_timestamp = max(s['timestamp'] for s in samples)
+        # Extract timestamp range. Batches arrive time-ordered from
+        # WatchConnectivity, so the range is just the endpoints; only fall
+        # back to a full scan if a batch shows up out of order.
+        start_timestamp = samples[0]['timestamp']
+        end_timestamp = samples[-1]['timestamp']
+        if start_timestamp > end_timestamp:
+            start_timestamp = min(s['timestamp'] for s in samples)
+            end_timestamp = max(s['timestamp'] for s in samples)
         sample_count = len(samples)
 
-        # v2.6: Check if buffer already exists for this time range
-        # This prevents duplicate inserts when WatchConnectivity sends the same batch multiple times
-        cursor.execute("""
-            SELECT buffer_id FROM raw_sensor_buffer
-            WHERE session_id = ?
-            AND start_timestamp = ?
-            AND end_timestamp = ?
-        """, (session_id, start_timestamp, end_timestamp))
-
-        existing_buffer = cursor.fetchone()
-        if existing_buffer:
-            print(f"⚠️  Buffer already exists for time range {start_timestamp}-{end_timestamp}, skipping duplicate")
-            conn.close()
-            return
-
-        # Convert to CSV format and compress
-        # Format: timestamp,rotX,rotY,rotZ,accX,accY,accZ,gravX,gravY,gravZ,quatW,quatX,quatY,quatZ
-        csv_lines = []
-        for s in samples:
-            line = f"{s['timestamp']},{s['rotationRateX']},{s['rotationRateY']},{s['rotationRateZ']}," \
-                   f"{s['accelerationX']},{s['accelerationY']},{s['accelerationZ']}," \
-                   f"{s['gravityX']},{s['gravityY']},{s['gravityZ']}," \
-                   f"{s['quaternionW']},{s['quaternionX']},{s['quaternionY']},{s['quaternionZ']}"
-            csv_lines.append(line)
-
-        csv_data = "\n".join(csv_lines).encode('utf-8')
-        compressed_data = gzip.compress(csv_data)
+        # Without the unique index, INSERT OR IGNORE would silently stop
+        # deduplicating resent batches: keep the explicit duplicate probe
+        if not _buffer_dedup_indexed:
+            cursor.execute(
+                "SELECT 1 FROM raw_sensor_buffer WHERE session_id = ? "
+                "AND start_timestamp = ? AND end_timestamp = ?",
+                (session_id, start_timestamp, end_timestamp))
+            if cursor.fetchone() is not None:
+                print(f"⚠️  Buffer already exists for time range {start_timestamp}-{end_timestamp}, skipping duplicate")
+                return
+
+        # Columnar binary payload instead of CSV text: no per-value ASCII
+        # formatting on write, a zero-copy np.frombuffer on read, and ~4x
+        # fewer bytes handed to the compressor. Timestamps stay float64
+        # (epoch seconds need the mantissa); the 13 sensor channels pack
+        # as little-endian float32.
+        # Channel order: rotX,rotY,rotZ,accX,accY,accZ,gravX,gravY,gravZ,quatW,quatX,quatY,quatZ
+        arr = np.array(list(map(_SAMPLE_FIELDS, samples)), dtype=np.float64)
+        payload = (
+            _BINARY_BUFFER_MAGIC
+            + np.uint32(sample_count).astype('<u4').tobytes()
+            + arr[:, 0].astype('<f8').tobytes()
+            + arr[:, 1:].astype('<f4').tobytes()
+        )
+
+        # zstd frames are self-identifying (magic prefix), so readers can
+        # tell them apart from gzip rows written by older servers
+        if ZSTD_AVAILABLE:
+            compressed_data = _ZSTD_COMPRESSOR.compress(payload)
+        else:
+            # Level 1 is several times faster than the default (9) for only
+            # a marginally larger output
+            compressed_data = gzip.compress(payload, compresslevel=1)
 
         # Generate unique buffer ID
         buffer_id = f"buffer_{uuid.uuid4().hex[:12]}"
 
-        cursor.execute("""
-            INSERT INTO raw_sensor_buffer (
-                buffer_id, session_id, start_timestamp, end_timestamp,
-                sample_count, compressed_data
-            ) VALUES (?, ?, ?, ?, ?, ?)
-        """, (
+        # v2.6 dedup (WatchConnectivity can resend the same batch) is handled
+        # by the unique index on (session_id, start_timestamp, end_timestamp):
+        # OR IGNORE makes the duplicate a no-op in a single atomic statement
+        cursor.execute(_SQL_INSERT_BUFFER, (
             buffer_id, session_id, start_timestamp, end_timestamp,
             sample_count, compressed_data
         ))
 
-        conn.commit()
-        conn.close()
+        if cursor.rowcount == 0:
+            print(f"⚠️  Buffer already exists for time range {start_timestamp}-{end_timestamp}, skipping duplicate")
+            return
+
+        # No commit here: the writer loop commits once per drained batch of
+        # queued operations, so back-to-back sensor batches share one fsync
         print(f"💾 Saved {sample_count} raw samples to database (compressed: {len(compressed_data)} bytes)")
 
     except Exception as e:
@@ -222,6 +535,9 @@ def update_session_end(session_id: str, end_time: float, shot_count: int):
         end_time: Unix timestamp when session ended
         shot_count: Total shots detected in session
     """
+    # Make sure any buffered shots land before the session is finalized
+    flush_shot_buffer()
+
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -234,26 +550,127 @@ def update_session_end(session_id: str, end_time: float, shot_count: int):
             start_time = row['start_time']
             duration_minutes = int((end_time - start_time) / 60)
 
-            cursor.execute("""
-                UPDATE sessions
-                SET end_time = ?,
-                    duration_minutes = ?,
-                    shot_count = ?,
-                    updated_at = strftime('%s', 'now')
-                WHERE session_id = ?
-            """, (int(end_time), duration_minutes, shot_count, session_id))
+            cursor.execute(_SQL_UPDATE_SESSION_END,
+                           (int(end_time), duration_minutes, shot_count, session_id))
 
             conn.commit()
             print(f"💾 Updated session end: {session_id} ({duration_minutes} min, {shot_count} shots)")
         else:
             print(f"⚠️  Session not found in database: {session_id}")
 
-        conn.close()
-
     except Exception as e:
         print(f"❌ Error updating session end in database: {e}")
 
 
+# ============================================================================
+# Background Database Writer
+# ============================================================================
+
+# All database writes from the WebSocket handler go through this queue to a
+# single writer task, so the event loop never blocks on SQLite. FIFO order
+# preserves the session lifecycle (session -> samples/shots -> session_end).
+# Capped at 200 pending writes by _enqueue_db: past that something is badly
+# wrong with the disk, and unbounded buffering would just trade a stall for
+# an OOM. (Only rarely-queued lifecycle ops may briefly exceed the cap.)
+db_queue: "asyncio.Queue" = None
+_DB_QUEUE_MAX = 200
+
+_DB_DISPATCH = {
+    "session": insert_session,
+    "raw": insert_raw_sensor_buffer,
+    "shot": insert_shot,
+    "session_end": update_session_end,
+}
+
+
+# Data ops can be shed under pressure (a lost sensor batch or shot is one
+# gap in the record); session/session_end must not be - dropping a session
+# row makes every later write for that session fail its foreign key, and
+# dropping the end update leaves the session open forever. The queue
+# itself is unbounded; _enqueue_db enforces the cap so lifecycle ops can
+# always be admitted.
+_DB_DROPPABLE_OPS = frozenset({"raw", "shot"})
+
+
+def _enqueue_db(op: str, args: tuple):
+    """Queue a database write; over the cap, shed the oldest data op."""
+    if db_queue.qsize() >= _DB_QUEUE_MAX:
+        # Evict the oldest droppable entry. Drain and rebuild the whole
+        # queue so the survivors keep their FIFO order - re-queueing a
+        # session op behind newer shots would break the lifecycle ordering
+        # the FK constraints depend on
+        pending = []
+        try:
+            while True:
+                pending.append(db_queue.get_nowait())
+        except asyncio.QueueEmpty:
+            pass
+        # Settle join() accounting for the drained gets before re-queueing:
+        # each put below re-increments the unfinished count, but without
+        # these task_done calls a single eviction leaves db_queue.join()
+        # permanently unfinished and shutdown blocks for its full timeout
+        for _ in pending:
+            db_queue.task_done()
+
+        dropped_op = None
+        for i, entry in enumerate(pending):
+            if entry[0] in _DB_DROPPABLE_OPS:
+                dropped_op = pending.pop(i)[0]
+                break
+        for entry in pending:
+            db_queue.put_nowait(entry)
+
+        if dropped_op is not None:
+            print(f"⚠️  DB queue full, dropped oldest pending write ({dropped_op})")
+        elif op in _DB_DROPPABLE_OPS:
+            # Nothing shed and the new write is itself sheddable
+            print(f"⚠️  DB queue full, dropped {op} write")
+            return
+
+    db_queue.put_nowait((op, args))
+
+
+# Writer coalescing: after the first queued operation, wait briefly for more
+# so a burst of sensor batches shares one transaction (and one WAL fsync)
+# instead of committing per batch
+_DB_COALESCE_MAX = 16
+_DB_COALESCE_WAIT = 0.05  # seconds
+
+
+def _run_db_ops(ops: List[tuple]):
+    """Execute a drained batch of queued operations, then commit once."""
+    for op, args in ops:
+        try:
+            _DB_DISPATCH[op](*args)
+        except Exception as e:
+            print(f"❌ DB writer error ({op}): {e}")
+
+    conn = _db_conn
+    if conn is not None and conn.in_transaction:
+        try:
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️  DB writer commit failed: {e}")
+
+
+async def _db_writer_loop():
+    """Background task: drain the write queue onto a worker thread."""
+    while True:
+        ops = [await db_queue.get()]
+        try:
+            while len(ops) < _DB_COALESCE_MAX:
+                ops.append(await asyncio.wait_for(
+                    db_queue.get(), timeout=_DB_COALESCE_WAIT))
+        except asyncio.TimeoutError:
+            pass
+
+        try:
+            await asyncio.to_thread(_run_db_ops, ops)
+        finally:
+            for _ in ops:
+                db_queue.task_done()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
@@ -270,18 +687,42 @@ async def lifespan(app: FastAPI):
     # Ensure database directory exists
     database_path.parent.mkdir(parents=True, exist_ok=True)
 
+    # Open (and tune) the shared connection once up front
+    get_db_connection()
+
+    # Background writer for all WebSocket-originated database writes,
+    # periodic flush of the shot write buffer, daily planner-stat refresh
+    global db_queue
+    db_queue = asyncio.Queue()
+    writer_task = asyncio.create_task(_db_writer_loop())
+    flush_task = asyncio.create_task(_shot_flush_loop())
+    optimize_task = asyncio.create_task(_pragma_optimize_loop())
+
     yield
 
     # Shutdown
     print("\nShutting down MacOSTennisAgent backend...")
+    optimize_task.cancel()
+    flush_task.cancel()
+    try:
+        # Let queued writes land before closing the connection
+        await asyncio.wait_for(db_queue.join(), timeout=5.0)
+    except asyncio.TimeoutError:
+        print(f"⚠️  Shutdown with {db_queue.qsize()} database write(s) still queued")
+    writer_task.cancel()
+    flush_shot_buffer()
     active_sessions.clear()
+    close_db_connection()
 
 
 app = FastAPI(
     title="MacOSTennisAgent API",
     description="Real-time tennis swing detection service for Apple Watch",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson-backed responses when available: encoding the session/swing
+    # lists is measurably cheaper than the stdlib json default
+    default_response_class=_ResponseClass
 )
 
 # Enable CORS for development
@@ -305,7 +746,9 @@ async def websocket_endpoint(websocket: WebSocket):
 
     Protocol:
     - Client sends: SensorBatchMessage (JSON)
-    - Server responds: SwingDetectedMessage when swing detected
+    - Server responds: swings_detected binary frame (JSON, one frame per
+      batch with the batch's detected swings coalesced)
+    - Server responds: backpressure message when the receive queue runs hot
     - Server responds: Error messages if processing fails
     """
     await websocket.accept()
@@ -314,13 +757,88 @@ async def websocket_endpoint(websocket: WebSocket):
     current_session_id = None
     detector = None
 
+    # Decouple socket reads from processing: the reader keeps draining the
+    # socket while a batch is being processed, so frames queue here (bounded)
+    # instead of piling up in kernel/websocket buffers. None is the
+    # disconnect sentinel.
+    recv_queue: asyncio.Queue = asyncio.Queue()
+    dropped_frames = 0
+
+    async def _reader():
+        nonlocal dropped_frames
+        try:
+            while True:
+                data = await websocket.receive_text()
+                if recv_queue.qsize() >= _WS_RECV_QUEUE_MAX:
+                    # Shed the oldest sensor_batch frame, never a control
+                    # frame: dropping session_start/session_end breaks the
+                    # session lifecycle the same way shedding lifecycle DB
+                    # ops would (FK failures on every later write, sessions
+                    # never finalized). Same rule as _enqueue_db; the queue
+                    # is unbounded with the cap enforced here so control
+                    # frames can always be admitted.
+                    pending = []
+                    try:
+                        while True:
+                            pending.append(recv_queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        pass
+                    evicted = False
+                    for i, frame in enumerate(pending):
+                        if '"sensor_batch"' in frame:
+                            del pending[i]
+                            evicted = True
+                            break
+                    for frame in pending:
+                        recv_queue.put_nowait(frame)
+
+                    if not evicted and '"sensor_batch"' in data:
+                        # Backlog is all control frames: shed the new batch
+                        data = None
+                    if evicted or data is None:
+                        dropped_frames += 1
+                        if dropped_frames == 1 or dropped_frames % 100 == 0:
+                            print(f"⚠️  Receive queue full, {dropped_frames} frame(s) dropped so far")
+                    if data is None:
+                        continue
+                recv_queue.put_nowait(data)
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            # Anything else (e.g. a binary frame tripping receive_text)
+            # must still wake the processor, or it blocks on the queue
+            # forever and leaks the handler task and detector
+            print(f"⚠️  WebSocket reader error: {e}")
+        finally:
+            # Hand the disconnect to the processor; the unbounded queue
+            # takes the sentinel without eviction
+            recv_queue.put_nowait(None)
+
+    reader_task = asyncio.create_task(_reader())
+    backpressure_signaled = False
+
     try:
         while True:
-            # Receive message from client
-            data = await websocket.receive_text()
+            # Next frame from the reader
+            data = await recv_queue.get()
+            if data is None:
+                raise WebSocketDisconnect(code=1000)
+
+            # Queue running hot: ask the client to downsample. One signal
+            # per episode, re-armed once the queue drains.
+            depth = recv_queue.qsize()
+            if depth >= _WS_BACKPRESSURE_AT:
+                if not backpressure_signaled:
+                    backpressure_signaled = True
+                    await websocket.send_json({
+                        "type": "backpressure",
+                        "queued": depth
+                    })
+            elif backpressure_signaled and depth <= _WS_RECV_QUEUE_MAX // 4:
+                backpressure_signaled = False
 
             try:
-                message = json.loads(data)
+                message = _json_loads(data)
                 message_type = message.get("type", "")
 
                 # Handle session start
@@ -346,8 +864,8 @@ async def websocket_endpoint(websocket: WebSocket):
 
                     print(f"🎾 Session started: {session_id} ({device})")
 
-                    # Save session to database
-                    insert_session(session_id, device, datetime.now().timestamp())
+                    # Save session to database (background writer)
+                    _enqueue_db("session", (session_id, device, datetime.now().timestamp()))
 
                     await websocket.send_json({
                         "type": "session_started",
@@ -357,9 +875,20 @@ async def websocket_endpoint(websocket: WebSocket):
 
                 # Handle sensor batch
                 elif message_type == "sensor_batch":
-                    # Parse batch message
-                    batch = SensorBatchMessage(**message)
-                    session_id = batch.session_id
+                    # Hot path: the iOS client is trusted, so skip the
+                    # SensorBatchMessage re-validation (14 field validators
+                    # per sample, dominating per-batch CPU at 100 Hz) and
+                    # read the parsed dicts directly. SensorBatchMessage
+                    # remains the documented wire schema.
+                    session_id = message.get("session_id")
+                    raw_samples = message.get("samples") or []
+
+                    if not session_id:
+                        await websocket.send_json({
+                            "type": "error",
+                            "message": "session_id is required"
+                        })
+                        continue
 
                     # Get or create detector for this session
                     if session_id not in active_sessions:
@@ -374,57 +903,13 @@ async def websocket_endpoint(websocket: WebSocket):
 
                     detector = active_sessions[session_id]
 
-                    # Convert Pydantic models to SensorSample objects
-                    samples = []
-                    for sample_data in batch.samples:
-                        sample = SensorSample(
-                            timestamp=sample_data.timestamp,
-                            rotation_rate=(
-                                sample_data.rotationRateX,
-                                sample_data.rotationRateY,
-                                sample_data.rotationRateZ
-                            ),
-                            gravity=(
-                                sample_data.gravityX,
-                                sample_data.gravityY,
-                                sample_data.gravityZ
-                            ),
-                            acceleration=(
-                                sample_data.accelerationX,
-                                sample_data.accelerationY,
-                                sample_data.accelerationZ
-                            ),
-                            quaternion=(
-                                sample_data.quaternionW,
-                                sample_data.quaternionX,
-                                sample_data.quaternionY,
-                                sample_data.quaternionZ
-                            )
-                        )
-                        samples.append(sample)
-
-                    # Save raw sensor data to database
-                    # Convert samples list to dict format for storage
-                    sample_dicts = [
-                        {
-                            "timestamp": s.timestamp,
-                            "rotationRateX": s.rotation_x,
-                            "rotationRateY": s.rotation_y,
-                            "rotationRateZ": s.rotation_z,
-                            "accelerationX": s.accel_x,
-                            "accelerationY": s.accel_y,
-                            "accelerationZ": s.accel_z,
-                            "gravityX": s.gravity_x,
-                            "gravityY": s.gravity_y,
-                            "gravityZ": s.gravity_z,
-                            "quaternionW": s.quat_w,
-                            "quaternionX": s.quat_x,
-                            "quaternionY": s.quat_y,
-                            "quaternionZ": s.quat_z
-                        }
-                        for s in samples
-                    ]
-                    insert_raw_sensor_buffer(session_id, sample_dicts)
+                    # Save raw sensor data to database. The parsed sample
+                    # dicts already carry the wire field names the storage
+                    # path keys on, so they go in as-is - no intermediate
+                    # SensorSample round-trip or dict rebuild per sample.
+                    # Enqueued for the background writer: the handler moves
+                    # straight on to the next recv.
+                    _enqueue_db("raw", (session_id, raw_samples))
 
                     # Broadcast to relay clients (browser dashboards)
                     if relay_clients:
@@ -446,7 +931,7 @@ async def websocket_endpoint(websocket: WebSocket):
                                 "qy": s["quaternionY"],
                                 "qz": s["quaternionZ"]
                             }
-                            for s in sample_dicts
+                            for s in raw_samples
                         ]
                         relay_message = {
                             "type": "sensor_batch",
@@ -467,44 +952,90 @@ async def websocket_endpoint(websocket: WebSocket):
 
                     # Real-time swing detection (optional)
                     if ENABLE_REALTIME_SWING_DETECTION:
+                        # SoA handoff: the whole batch becomes one (n, 14)
+                        # float array for the detector's array path - no
+                        # per-sample SensorSample objects. In SensorLogger
+                        # mode the batch never leaves dict form. A malformed
+                        # sample raises KeyError into the generic error
+                        # handler below, same outcome as a validation
+                        # failure.
+                        batch_arr = np.array(
+                            list(map(_SAMPLE_FIELDS, raw_samples)),
+                            dtype=np.float64
+                        )
+
                         # Process batch and detect swings
-                        detected_peaks = detector.process_batch(samples)
+                        detected_peaks = detector.process_array(batch_arr)
+
+                        # Speed estimates for every peak in one vectorized
+                        # multiply rather than a Python call per peak
+                        swing_speeds = estimate_swing_speeds(
+                            np.array([p.rotation_magnitude for p in detected_peaks])
+                        ) if detected_peaks else ()
+
+                        # Collect the batch's swings for one coalesced send
+                        pending_swings = []
+                        for peak, est_speed in zip(detected_peaks, swing_speeds):
+                            # Cached session date prefix + integer
+                            # seconds-of-day: no fromtimestamp/strftime in
+                            # the burst path
+                            shot_id = (
+                                f"shot_{detector.shot_id_prefix}"
+                                f"{int(peak.timestamp) % 86400:05d}_"
+                                f"{detector.total_peaks_detected:03d}"
+                            )
 
-                        # Send swing detection messages
-                        for peak in detected_peaks:
-                            shot_id = f"shot_{datetime.fromtimestamp(peak.timestamp).strftime('%Y%m%d_%H%M%S')}_{detector.total_peaks_detected:03d}"
+                            # Shared by the payload and the database row
+                            # below (float cast keeps the message
+                            # serializable by either JSON encoder)
+                            speed_mph = float(est_speed)
+                            sensor_payload = peak.sensor_data.to_dict()
 
                             swing_data = {
                                 "shot_id": shot_id,
                                 "timestamp": peak.timestamp,
                                 "rotation_magnitude": peak.rotation_magnitude,
                                 "acceleration_magnitude": peak.acceleration_magnitude,
-                                "estimated_speed_mph": estimate_swing_speed(peak),
-                                "sensor_data": peak.sensor_data.to_dict()
+                                "estimated_speed_mph": speed_mph,
+                                "sensor_data": sensor_payload
                             }
 
-                            # Save shot to database
-                            insert_shot(
-                                shot_id=shot_id,
-                                session_id=session_id,
-                                timestamp=peak.timestamp,
-                                sequence_number=detector.total_peaks_detected,
-                                rotation_magnitude=peak.rotation_magnitude,
-                                acceleration_magnitude=peak.acceleration_magnitude,
-                                speed_mph=swing_data["estimated_speed_mph"],
-                                sensor_data=swing_data["sensor_data"]
-                            )
-
-                            response = SwingDetectedMessage(
-                                session_id=session_id,
-                                swing=swing_data
-                            )
-
-                            await websocket.send_json(response.dict())
+                            # Save shot to database (background writer)
+                            _enqueue_db("shot", (
+                                shot_id, session_id, peak.timestamp,
+                                detector.total_peaks_detected,
+                                peak.rotation_magnitude,
+                                peak.acceleration_magnitude,
+                                speed_mph,
+                                sensor_payload
+                            ))
+
+                            pending_swings.append(swing_data)
                             print(f"🎾 Swing detected: {shot_id} (rotation: {peak.rotation_magnitude:.2f} rad/s)")
+
+                        # Coalesce the batch's swings into one binary frame:
+                        # a burst pays framing + encode + send once instead
+                        # of per peak, and the client decodes one message
+                        if pending_swings:
+                            frame = _json_dumps_bytes({
+                                "type": "swings_detected",
+                                "session_id": session_id,
+                                "swings": pending_swings
+                            })
+                            if len(frame) <= _WS_FRAME_MAX_BYTES:
+                                await websocket.send_bytes(frame)
+                            else:
+                                # Degenerate burst: fall back to one frame
+                                # per swing to stay under the cap
+                                for swing_data in pending_swings:
+                                    await websocket.send_bytes(_json_dumps_bytes({
+                                        "type": "swings_detected",
+                                        "session_id": session_id,
+                                        "swings": [swing_data]
+                                    }))
                     else:
                         # SensorLogger mode: Just store raw data, skip detection
-                        print(f"📦 Stored batch: {len(samples)} samples (session: {session_id})")
+                        print(f"📦 Stored batch: {len(raw_samples)} samples (session: {session_id})")
 
                 # Handle session end
                 elif message_type == "session_end":
@@ -525,12 +1056,11 @@ async def websocket_endpoint(websocket: WebSocket):
                             print(f"   (Swing detection disabled - analyze offline)")
                             shot_count = 0  # No real-time detection, shots will be added offline
 
-                        # Update session in database
-                        update_session_end(
-                            session_id=session_id,
-                            end_time=datetime.now().timestamp(),
-                            shot_count=shot_count
-                        )
+                        # Update session in database; FIFO queue order
+                        # guarantees it lands after the session's writes
+                        _enqueue_db("session_end", (
+                            session_id, datetime.now().timestamp(), shot_count
+                        ))
 
                         # Clean up
                         del active_sessions[session_id]
@@ -547,7 +1077,9 @@ async def websocket_endpoint(websocket: WebSocket):
                         "message": f"Unknown message type: {message_type}"
                     })
 
-            except json.JSONDecodeError as e:
+            # ValueError covers both stdlib json.JSONDecodeError and
+            # orjson.JSONDecodeError (each subclasses it)
+            except ValueError as e:
                 await websocket.send_json({
                     "type": "error",
                     "message": f"Invalid JSON: {str(e)}"
@@ -572,6 +1104,9 @@ async def websocket_endpoint(websocket: WebSocket):
     except Exception as e:
         print(f"❌ WebSocket error: {e}")
 
+    finally:
+        reader_task.cancel()
+
 
 # ============================================================================
 # WebSocket Relay Endpoint - Broadcast to Browser Dashboards
@@ -593,7 +1128,7 @@ async def websocket_relay(websocket: WebSocket):
         while True:
             data = await websocket.receive_text()
             # Browser can send control messages if needed
-            message = json.loads(data)
+            message = _json_loads(data)
             if message.get("type") == "ping":
                 await websocket.send_json({"type": "pong"})
     except WebSocketDisconnect:
@@ -641,12 +1176,16 @@ async def health_check():
 @app.get("/api/detector/stats")
 async def get_detector_stats():
     """Get statistics from active detectors."""
+    # Snapshot first: the WebSocket handler adds/removes sessions on the
+    # same loop, and a mutation mid-iteration would raise RuntimeError
+    sessions_snapshot = tuple(active_sessions.items())
+
     stats = {}
-    for session_id, detector in active_sessions.items():
+    for session_id, detector in sessions_snapshot:
         stats[session_id] = detector.get_statistics()
 
     return {
-        "active_sessions": len(active_sessions),
+        "active_sessions": len(sessions_snapshot),
         "sessions": stats
     }
 
@@ -662,23 +1201,18 @@ async def list_sessions(limit: int = 50):
     Returns:
         List of sessions with statistics
     """
-    try:
+    # Snapshot the active-session keys on the event loop, where the
+    # WebSocket handler mutates the dict - iterating it from the worker
+    # thread below could see a mid-mutation dict and raise RuntimeError
+    active_snapshot = list(active_sessions.keys())
+
+    # Blocking query + row building runs on a worker thread so the event
+    # loop keeps serving the WebSocket while the REST read is in flight
+    def _query():
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT
-                session_id,
-                device,
-                date,
-                datetime(start_time, 'unixepoch') as start_datetime,
-                datetime(end_time, 'unixepoch') as end_datetime,
-                duration_minutes,
-                shot_count
-            FROM sessions
-            ORDER BY start_time DESC
-            LIMIT ?
-        """, (limit,))
+        cursor.execute(_SQL_LIST_SESSIONS, (limit,))
 
         sessions = []
         for row in cursor.fetchall():
@@ -692,14 +1226,14 @@ async def list_sessions(limit: int = 50):
                 "shot_count": row['shot_count']
             })
 
-        conn.close()
-
         return {
             "total": len(sessions),
             "sessions": sessions,
-            "active_sessions": list(active_sessions.keys())
+            "active_sessions": active_snapshot
         }
 
+    try:
+        return await asyncio.to_thread(_query)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
@@ -724,44 +1258,21 @@ async def get_session(session_id: str):
             "statistics": detector.get_statistics()
         }
 
-    # Query database for completed session
-    try:
+    # Query database for completed session (worker thread; see list_sessions)
+    def _query():
         conn = get_db_connection()
         cursor = conn.cursor()
 
         # Get session info
-        cursor.execute("""
-            SELECT
-                session_id,
-                device,
-                date,
-                datetime(start_time, 'unixepoch') as start_datetime,
-                datetime(end_time, 'unixepoch') as end_datetime,
-                duration_minutes,
-                shot_count
-            FROM sessions
-            WHERE session_id = ?
-        """, (session_id,))
+        cursor.execute(_SQL_GET_SESSION, (session_id,))
 
         session_row = cursor.fetchone()
 
         if not session_row:
-            conn.close()
             raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
 
         # Get all shots for this session
-        cursor.execute("""
-            SELECT
-                shot_id,
-                timestamp,
-                sequence_number,
-                rotation_magnitude,
-                acceleration_magnitude,
-                speed_mph
-            FROM shots
-            WHERE session_id = ?
-            ORDER BY sequence_number
-        """, (session_id,))
+        cursor.execute(_SQL_SESSION_SHOTS, (session_id,))
 
         shots = []
         for row in cursor.fetchall():
@@ -774,8 +1285,6 @@ async def get_session(session_id: str):
                 "speed_mph": row['speed_mph']
             })
 
-        conn.close()
-
         return {
             "session_id": session_row['session_id'],
             "device": session_row['device'],
@@ -788,6 +1297,8 @@ async def get_session(session_id: str):
             "status": "completed"
         }
 
+    try:
+        return await asyncio.to_thread(_query)
     except HTTPException:
         raise
     except Exception as e:
@@ -806,58 +1317,22 @@ async def list_swings(session_id: str = None, limit: int = 100):
     Returns:
         List of shots with metrics
     """
-    try:
+    def _query():
         conn = get_db_connection()
         cursor = conn.cursor()
 
+        # Plain tuples + zip against the column tuple: skips the per-key
+        # sqlite3.Row name lookups and the eight-literal dict build per row
+        cursor.row_factory = None
+
         if session_id:
             # Get shots for specific session
-            cursor.execute("""
-                SELECT
-                    shot_id,
-                    session_id,
-                    timestamp,
-                    sequence_number,
-                    rotation_magnitude,
-                    acceleration_magnitude,
-                    speed_mph,
-                    datetime(timestamp, 'unixepoch') as shot_datetime
-                FROM shots
-                WHERE session_id = ?
-                ORDER BY sequence_number
-                LIMIT ?
-            """, (session_id, limit))
+            cursor.execute(_SQL_SWINGS_BY_SESSION, (session_id, limit))
         else:
             # Get recent shots across all sessions
-            cursor.execute("""
-                SELECT
-                    shot_id,
-                    session_id,
-                    timestamp,
-                    sequence_number,
-                    rotation_magnitude,
-                    acceleration_magnitude,
-                    speed_mph,
-                    datetime(timestamp, 'unixepoch') as shot_datetime
-                FROM shots
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """, (limit,))
+            cursor.execute(_SQL_SWINGS_RECENT, (limit,))
 
-        shots = []
-        for row in cursor.fetchall():
-            shots.append({
-                "shot_id": row['shot_id'],
-                "session_id": row['session_id'],
-                "timestamp": row['timestamp'],
-                "shot_datetime": row['shot_datetime'],
-                "sequence_number": row['sequence_number'],
-                "rotation_magnitude": row['rotation_magnitude'],
-                "acceleration_magnitude": row['acceleration_magnitude'],
-                "speed_mph": row['speed_mph']
-            })
-
-        conn.close()
+        shots = [dict(zip(_SWING_COLS, row)) for row in cursor.fetchall()]
 
         return {
             "total": len(shots),
@@ -865,6 +1340,8 @@ async def list_swings(session_id: str = None, limit: int = 100):
             "shots": shots
         }
 
+    try:
+        return await asyncio.to_thread(_query)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
@@ -884,5 +1361,9 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        log_level="info",
+        # No permessage-deflate: the 100 Hz sensor frames are small JSON
+        # numerics that compress poorly, so zlib on every frame is pure
+        # per-message CPU on both sides of the socket
+        ws_per_message_deflate=False
     )
@@ -6,16 +6,131 @@ Adapted from swing_analyzer.py for streaming data processing
 Uses sliding window buffer and scipy peak detection to identify swings in real-time
 """
 
+import math
 import numpy as np
-from collections import deque
 from typing import List, Dict, Optional, Tuple
 from scipy.signal import find_peaks
+from datetime import datetime
 import time
 
+# Numba is optional: when present the peak scan runs as a compiled kernel,
+# otherwise we fall back to the scipy find_peaks path
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _detect_kernel(rot, timestamps, threshold, min_distance, min_interval, last_ts):
+    """
+    Fused single-pass scan: magnitude computation + local-maximum check,
+    without materializing a magnitude array. Each magnitude is computed
+    once and carried in a rolling prev/cur/next window, so the rotation
+    columns are read exactly once. Candidates then go through the same
+    highest-peak-first distance selection find_peaks uses, so the kernel
+    and the scipy fallback accept identical peaks.
+
+    Returns (peak indices, peak magnitudes). Compiled with Numba when
+    available; plain Python otherwise (only used via the compiled path).
+    """
+    n = rot.shape[0]
+    cand_idx = np.empty(n, dtype=np.int64)
+    cand_mag = np.empty(n, dtype=np.float32)
+    m = 0
+
+    if n < 3:
+        return cand_idx[:0], cand_mag[:0]
+
+    prev = math.sqrt(rot[0, 0]**2 + rot[0, 1]**2 + rot[0, 2]**2)
+    cur = math.sqrt(rot[1, 0]**2 + rot[1, 1]**2 + rot[1, 2]**2)
+
+    for i in range(1, n - 1):
+        nxt = math.sqrt(rot[i + 1, 0]**2 + rot[i + 1, 1]**2 + rot[i + 1, 2]**2)
+        if cur >= threshold and prev < cur and nxt <= cur:
+            cand_idx[m] = i
+            cand_mag[m] = cur
+            m += 1
+        prev = cur
+        cur = nxt
+
+    # Distance filter, highest magnitude first (find_peaks' rule): a kept
+    # peak suppresses smaller candidates within min_distance on either
+    # side. Committing greedily to the first threshold crossing instead
+    # would let a noise wiggle on a swing's rising edge mask the apex.
+    # Candidates are rare (above-threshold local maxima only), so this
+    # argsort runs over a handful of entries.
+    keep = np.ones(m, dtype=np.bool_)
+    order = np.argsort(cand_mag[:m])
+    for k in range(m - 1, -1, -1):
+        j = order[k]
+        if not keep[j]:
+            continue
+        q = j - 1
+        while q >= 0 and cand_idx[j] - cand_idx[q] < min_distance:
+            keep[q] = False
+            q -= 1
+        q = j + 1
+        while q < m and cand_idx[q] - cand_idx[j] < min_distance:
+            keep[q] = False
+            q += 1
+
+    # Interval filter in time order; last_ts carries suppression across
+    # batch boundaries, mirroring the Python-side filter on the scipy path
+    out_idx = np.empty(m, dtype=np.int64)
+    out_mag = np.empty(m, dtype=np.float32)
+    count = 0
+    last_peak_ts = last_ts
+    for j in range(m):
+        if keep[j] and timestamps[cand_idx[j]] - last_peak_ts >= min_interval:
+            out_idx[count] = cand_idx[j]
+            out_mag[count] = cand_mag[j]
+            count += 1
+            last_peak_ts = timestamps[cand_idx[j]]
+
+    return out_idx[:count], out_mag[:count]
+
+
+if NUMBA_AVAILABLE:
+    # nogil: the kernel only touches NumPy buffers, so the GIL is released
+    # while it runs and the asyncio loop keeps serving WebSocket I/O
+    _detect_kernel = njit(cache=True, fastmath=True, nogil=True)(_detect_kernel)
+
+    # Warm the kernel at import so the first real batch doesn't pay the
+    # compile (cache=True makes this a disk load after the first run)
+    _detect_kernel(
+        np.zeros((3, 3), dtype=np.float32),
+        np.zeros(3, dtype=np.float64),
+        np.float32(1.0), 1, 1.0, 0.0
+    )
+
+
+# Structured dtype for the SwingDetector ring buffer: one row per sample,
+# float32 for the sensor channels (more than Watch sensor precision) and
+# float64 for the epoch timestamps
+SAMPLE_DTYPE = np.dtype([
+    ('ts', 'f8'),
+    ('rot', 'f4', 3),
+    ('grav', 'f4', 3),
+    ('accel', 'f4', 3),
+    ('quat', 'f4', 4),
+])
+
 
 class SensorSample:
     """Represents a single sensor reading from Apple Watch."""
 
+    # Fixed attribute set: slots drop the per-instance __dict__ (~60% less
+    # memory per sample) and make attribute access a fixed-offset load
+    __slots__ = (
+        'timestamp',
+        'rotation_x', 'rotation_y', 'rotation_z',
+        'gravity_x', 'gravity_y', 'gravity_z',
+        'accel_x', 'accel_y', 'accel_z',
+        'quat_w', 'quat_x', 'quat_y', 'quat_z',
+        'rotation_magnitude', 'acceleration_magnitude'
+    )
+
     def __init__(self, timestamp: float, rotation_rate: Tuple[float, float, float],
                  gravity: Tuple[float, float, float], acceleration: Tuple[float, float, float],
                  quaternion: Tuple[float, float, float, float]):
@@ -35,15 +150,13 @@ class SensorSample:
         self.accel_x, self.accel_y, self.accel_z = acceleration
         self.quat_w, self.quat_x, self.quat_y, self.quat_z = quaternion
 
-    @property
-    def rotation_magnitude(self) -> float:
-        """Calculate magnitude of rotation vector (rad/s)."""
-        return np.sqrt(self.rotation_x**2 + self.rotation_y**2 + self.rotation_z**2)
-
-    @property
-    def acceleration_magnitude(self) -> float:
-        """Calculate magnitude of acceleration vector (g)."""
-        return np.sqrt(self.accel_x**2 + self.accel_y**2 + self.accel_z**2)
+        # Magnitudes computed once at construction (math.sqrt on scalars is
+        # far cheaper than np.sqrt) instead of being re-derived on every
+        # property read during serialization
+        self.rotation_magnitude = math.sqrt(
+            self.rotation_x**2 + self.rotation_y**2 + self.rotation_z**2)
+        self.acceleration_magnitude = math.sqrt(
+            self.accel_x**2 + self.accel_y**2 + self.accel_z**2)
 
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization."""
@@ -78,6 +191,9 @@ class SensorSample:
 class SwingPeak:
     """Represents a detected swing peak."""
 
+    __slots__ = ('timestamp', 'peak_index', 'rotation_magnitude',
+                 'acceleration_magnitude', 'sensor_data')
+
     def __init__(self, timestamp: float, peak_index: int, rotation_magnitude: float,
                  acceleration_magnitude: float, sensor_data: SensorSample):
         """
@@ -131,18 +247,36 @@ class SwingDetector:
         self.min_distance = min_distance
         self.height_multiplier = height_multiplier
 
-        # Sliding window buffer
-        self.buffer: deque[SensorSample] = deque(maxlen=buffer_size)
+        # float32 copy of the threshold so hot-path comparisons against the
+        # float32 magnitude array never promote to float64
+        self._threshold32 = np.float32(threshold)
+
+        # Sliding window as a SoA ring buffer: all 14 channels stored
+        # contiguously (SAMPLE_DTYPE) so vectorized passes read packed
+        # float32 rows instead of chasing per-sample Python objects.
+        # No deque alongside it - eviction is just the head index wrapping,
+        # with zero per-sample Python object churn.
+        self._ring = np.zeros(buffer_size, dtype=SAMPLE_DTYPE)
+        self._head = 0
+        self._count = 0
 
         # Track detected peaks to avoid duplicates
         self.last_peak_timestamp = 0.0
         self.min_peak_interval = 1.5  # seconds (prevents multi-counting same swing)
 
+        # Absolute count of samples already covered by a peak scan; lets
+        # process_batch re-scan only the new tail plus a min_distance margin
+        self._scanned_upto = 0
+
         # Statistics
         self.total_samples_processed = 0
         self.total_peaks_detected = 0
         self.session_start_time = time.time()
 
+        # Date prefix for shot IDs, formatted once per session: strftime
+        # costs tens of microseconds and otherwise runs per detected peak
+        self.shot_id_prefix = datetime.now().strftime('%Y%m%d_')
+
     def process_sample(self, sample: SensorSample) -> List[SwingPeak]:
         """
         Process a single sensor sample and detect any new swings.
@@ -171,39 +305,104 @@ class SwingDetector:
             return []
 
         # Add samples to buffer
-        self.buffer.extend(samples)
         self.total_samples_processed += len(samples)
+        self._append_to_ring(samples)
 
-        # Need minimum buffer size to detect peaks
-        if len(self.buffer) < self.min_distance * 2:
+        return self._detect_new_peaks()
+
+    def process_array(self, arr: np.ndarray) -> List[SwingPeak]:
+        """
+        Process a batch given as a single (n, 14) float array.
+
+        SoA fast path for the WebSocket handler: the whole batch lands in
+        the ring via column-slice assignment, with no per-sample Python
+        objects. Column order matches the binary buffer layout:
+        timestamp, rotXYZ, accXYZ, gravXYZ, quatWXYZ.
+
+        Args:
+            arr: 2D float64 array, one row per sample, 14 columns
+
+        Returns:
+            List of detected SwingPeak objects
+        """
+        if len(arr) == 0:
             return []
 
-        # Extract rotation magnitudes from buffer
-        magnitudes = np.array([s.rotation_magnitude for s in self.buffer])
-        timestamps = np.array([s.timestamp for s in self.buffer])
+        self.total_samples_processed += len(arr)
+        self._append_array(arr)
 
-        # Detect peaks using scipy
-        peaks, properties = find_peaks(
-            magnitudes,
-            height=self.threshold,
-            distance=self.min_distance
-        )
+        return self._detect_new_peaks()
+
+    def _detect_new_peaks(self) -> List[SwingPeak]:
+        """Scan the unscanned tail of the ring for new peaks."""
+        # Need minimum buffer size to detect peaks
+        if self._count < self.min_distance * 2:
+            return []
+
+        ring = self._ordered_view()
+        rot = ring['rot']
+        timestamps = ring['ts']
+
+        # Only the unscanned tail (plus a min_distance margin) can produce a
+        # new peak - samples further back were already evaluated last call
+        count = len(ring)
+        oldest_abs = self.total_samples_processed - count
+        start_abs = max(oldest_abs, self._scanned_upto - self.min_distance)
+        scan_start = start_abs - oldest_abs
+        self._scanned_upto = self.total_samples_processed
+
+        if NUMBA_AVAILABLE:
+            # Fused compiled scan: magnitudes are computed inside the kernel
+            # while it looks for peaks, so the tail is read in one pass with
+            # no magnitude array materialized (and no separate idle check -
+            # a quiet tail is just a scan that accepts nothing)
+            peaks, peak_mags = _detect_kernel(
+                rot[scan_start:],
+                timestamps[scan_start:],
+                self._threshold32,
+                self.min_distance,
+                self.min_peak_interval,
+                self.last_peak_timestamp
+            )
+        else:
+            # Vectorized fallback: one einsum magnitude pass over the tail
+            # (float32 throughout - f4 inputs keep the einsum f4, doubling
+            # SIMD lanes vs float64), then scipy peak detection. Idle fast
+            # path: most batches have no above-threshold motion, so a single
+            # max() reduction avoids the find_peaks call entirely.
+            tail_rot = rot[scan_start:]
+            tail = np.sqrt(np.einsum('ij,ij->i', tail_rot, tail_rot)).astype(
+                np.float32, copy=False)
+            if tail.max() < self._threshold32:
+                return []
+
+            peaks, properties = find_peaks(
+                tail,
+                height=self._threshold32,
+                distance=self.min_distance
+            )
+            peak_mags = tail[peaks]
+        if scan_start:
+            peaks = peaks + scan_start
 
         # Filter peaks that are too close to previous detections
         detected_swings = []
-        for peak_idx in peaks:
+        for peak_idx, peak_mag in zip(peaks, peak_mags):
             peak_timestamp = timestamps[peak_idx]
 
             # Skip if too close to last detected peak
             if peak_timestamp - self.last_peak_timestamp < self.min_peak_interval:
                 continue
 
-            # Create SwingPeak object
-            sample_at_peak = list(self.buffer)[peak_idx]
+            # Rehydrate a SensorSample from the ring row; peaks are rare so
+            # the per-peak object construction cost is negligible
+            sample_at_peak = self._sample_at(ring, peak_idx)
+            # float() casts: peaks are rare, and plain floats keep the
+            # payload serializable by any JSON encoder downstream
             swing_peak = SwingPeak(
-                timestamp=peak_timestamp,
-                peak_index=peak_idx,
-                rotation_magnitude=magnitudes[peak_idx],
+                timestamp=float(peak_timestamp),
+                peak_index=int(peak_idx),
+                rotation_magnitude=float(peak_mag),
                 acceleration_magnitude=sample_at_peak.acceleration_magnitude,
                 sensor_data=sample_at_peak
             )
@@ -214,9 +413,72 @@ class SwingDetector:
 
         return detected_swings
 
+    def _append_to_ring(self, samples: List[SensorSample]):
+        """Write a batch of samples into the SoA ring buffer."""
+        if len(samples) > self.buffer_size:
+            samples = samples[-self.buffer_size:]
+
+        rows = np.array(
+            [
+                (
+                    s.timestamp,
+                    (s.rotation_x, s.rotation_y, s.rotation_z),
+                    (s.gravity_x, s.gravity_y, s.gravity_z),
+                    (s.accel_x, s.accel_y, s.accel_z),
+                    (s.quat_w, s.quat_x, s.quat_y, s.quat_z)
+                )
+                for s in samples
+            ],
+            dtype=SAMPLE_DTYPE
+        )
+
+        idx = (self._head + np.arange(len(samples))) % self.buffer_size
+        self._ring[idx] = rows
+        self._head = (self._head + len(samples)) % self.buffer_size
+        self._count = min(self._count + len(samples), self.buffer_size)
+
+    def _append_array(self, arr: np.ndarray):
+        """Write an (n, 14) sample array into the ring via column slices."""
+        if len(arr) > self.buffer_size:
+            arr = arr[-self.buffer_size:]
+
+        # empty, not zeros: every field is assigned below, so the zero fill
+        # would be pure wasted bandwidth
+        rows = np.empty(len(arr), dtype=SAMPLE_DTYPE)
+        rows['ts'] = arr[:, 0]
+        rows['rot'] = arr[:, 1:4]
+        rows['accel'] = arr[:, 4:7]
+        rows['grav'] = arr[:, 7:10]
+        rows['quat'] = arr[:, 10:14]
+
+        idx = (self._head + np.arange(len(arr))) % self.buffer_size
+        self._ring[idx] = rows
+        self._head = (self._head + len(arr)) % self.buffer_size
+        self._count = min(self._count + len(arr), self.buffer_size)
+
+    def _ordered_view(self) -> np.ndarray:
+        """Return the ring contents in buffer order (oldest first)."""
+        if self._count < self.buffer_size:
+            return self._ring[:self._count]
+        return np.concatenate((self._ring[self._head:], self._ring[:self._head]))
+
+    @staticmethod
+    def _sample_at(ring: np.ndarray, idx: int) -> SensorSample:
+        """Rebuild a SensorSample from an ordered-view ring row."""
+        row = ring[idx]
+        return SensorSample(
+            timestamp=float(row['ts']),
+            rotation_rate=tuple(row['rot'].tolist()),
+            gravity=tuple(row['grav'].tolist()),
+            acceleration=tuple(row['accel'].tolist()),
+            quaternion=tuple(row['quat'].tolist())
+        )
+
     def reset(self):
         """Reset detector state (clears buffer and statistics)."""
-        self.buffer.clear()
+        self._head = 0
+        self._count = 0
+        self._scanned_upto = 0
         self.last_peak_timestamp = 0.0
         self.total_samples_processed = 0
         self.total_peaks_detected = 0
@@ -230,7 +492,7 @@ class SwingDetector:
         return {
             'total_samples_processed': self.total_samples_processed,
             'total_peaks_detected': self.total_peaks_detected,
-            'buffer_size': len(self.buffer),
+            'buffer_size': self._count,
             'buffer_capacity': self.buffer_size,
             'elapsed_time_seconds': elapsed_time,
             'sample_rate_hz': sample_rate,
@@ -239,6 +501,29 @@ class SwingDetector:
         }
 
 
+# Speed model: linear velocity = angular velocity * radius, converted to mph.
+# Radius assumes average arm length ~0.6m plus racket extension ~0.7m.
+_ARM_LENGTH_M = 0.6
+_RACKET_LENGTH_M = 0.7
+_SPEED_MPH_PER_RAD_S = (_ARM_LENGTH_M + _RACKET_LENGTH_M) * 2.237  # m/s -> mph
+
+
+def estimate_swing_speeds(rotation_magnitudes: np.ndarray) -> np.ndarray:
+    """
+    Estimate racket speeds for an array of peak rotation magnitudes.
+
+    Vectorized form of estimate_swing_speed: one multiply over the whole
+    array instead of a Python call per peak.
+
+    Args:
+        rotation_magnitudes: Peak rotation magnitudes (rad/s)
+
+    Returns:
+        Estimated speeds in mph, same shape as the input
+    """
+    return rotation_magnitudes * _SPEED_MPH_PER_RAD_S
+
+
 def estimate_swing_speed(peak: SwingPeak) -> float:
     """
     Estimate racket speed from sensor data.
@@ -252,19 +537,7 @@ def estimate_swing_speed(peak: SwingPeak) -> float:
     Returns:
         Estimated speed in mph
     """
-    # Simplified conversion: rotation_magnitude (rad/s) * arm_length * conversion
-    # Assuming average arm length ~0.6m and racket extension
-    arm_length_m = 0.6
-    racket_length_m = 0.7
-    total_length_m = arm_length_m + racket_length_m  # ~1.3m
-
-    # Linear velocity = angular_velocity * radius
-    linear_velocity_ms = peak.rotation_magnitude * total_length_m
-
-    # Convert m/s to mph
-    mph = linear_velocity_ms * 2.237
-
-    return mph
+    return peak.rotation_magnitude * _SPEED_MPH_PER_RAD_S
 
 
 def classify_swing_type(peak: SwingPeak) -> str:
@@ -14,10 +14,104 @@ import json
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from collections import defaultdict
 import statistics
 
+# orjson is optional: noticeably faster for the large session-report blobs
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Materialized per-session/per-stroke rollup maintained by the Zepp importer.
+# Aggregating over it reads O(#sessions) rows instead of re-scanning every
+# shot on each analyzer call; connect() backfills it for older databases.
+_SQL_ROLLUP_TABLE = """
+    CREATE TABLE IF NOT EXISTS zepp_session_stats (
+        session_id TEXT NOT NULL,
+        shot_type TEXT NOT NULL,
+        shot_count INTEGER NOT NULL DEFAULT 0,
+        shots_with_speed INTEGER NOT NULL DEFAULT 0,
+        speed_sum REAL NOT NULL DEFAULT 0,
+        max_speed REAL NOT NULL DEFAULT 0,
+        power_sum REAL NOT NULL DEFAULT 0,
+        consistency_sum REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (session_id, shot_type)
+    );
+
+    CREATE TRIGGER IF NOT EXISTS trg_zepp_session_stats
+    AFTER INSERT ON shots
+    WHEN NEW.session_id LIKE 'zepp_%'
+    BEGIN
+        INSERT INTO zepp_session_stats (
+            session_id, shot_type, shot_count, shots_with_speed,
+            speed_sum, max_speed, power_sum, consistency_sum
+        ) VALUES (
+            NEW.session_id, NEW.shot_type, 1,
+            CASE WHEN NEW.speed_mph > 0 THEN 1 ELSE 0 END,
+            CASE WHEN NEW.speed_mph > 0 THEN NEW.speed_mph ELSE 0 END,
+            COALESCE(NEW.speed_mph, 0),
+            COALESCE(NEW.power, 0),
+            COALESCE(NEW.consistency, 0)
+        )
+        ON CONFLICT(session_id, shot_type) DO UPDATE SET
+            shot_count = shot_count + 1,
+            shots_with_speed = shots_with_speed
+                + CASE WHEN NEW.speed_mph > 0 THEN 1 ELSE 0 END,
+            speed_sum = speed_sum
+                + CASE WHEN NEW.speed_mph > 0 THEN NEW.speed_mph ELSE 0 END,
+            max_speed = MAX(max_speed, COALESCE(NEW.speed_mph, 0)),
+            power_sum = power_sum + COALESCE(NEW.power, 0),
+            consistency_sum = consistency_sum + COALESCE(NEW.consistency, 0);
+    END;
+"""
+
+_SQL_ROLLUP_BACKFILL = """
+    INSERT INTO zepp_session_stats (
+        session_id, shot_type, shot_count, shots_with_speed,
+        speed_sum, max_speed, power_sum, consistency_sum
+    )
+    SELECT
+        session_id,
+        shot_type,
+        COUNT(*),
+        COUNT(CASE WHEN speed_mph > 0 THEN 1 END),
+        COALESCE(SUM(CASE WHEN speed_mph > 0 THEN speed_mph END), 0),
+        COALESCE(MAX(speed_mph), 0),
+        COALESCE(SUM(power), 0),
+        COALESCE(SUM(consistency), 0)
+    FROM shots
+    -- range predicate instead of LIKE 'zepp_%' so the session_id index is
+    -- usable ('`' is the character after '_', closing the prefix range)
+    WHERE session_id >= 'zepp_' AND session_id < 'zepp`'
+    GROUP BY session_id, shot_type
+"""
+
+
+def _compile_row_builder(spec: List[Tuple[str, Optional[int], Any]]):
+    """
+    Exec-compile a specialized tuple-row -> dict builder.
+
+    ``spec`` is a list of (output_key, round_digits, default) per column,
+    in cursor order; ``round_digits=None`` copies the value through. The
+    generated function is a single straight-line dict display — no per-row
+    key lookups or branch dispatch, just the rounding each column needs.
+    """
+    parts = []
+    for i, (key, ndigits, default) in enumerate(spec):
+        if ndigits is None:
+            parts.append(f"{key!r}: r[{i}]")
+        else:
+            parts.append(
+                f"{key!r}: round(r[{i}], {ndigits}) if r[{i}] else {default!r}"
+            )
+    namespace: Dict[str, Any] = {}
+    exec(f"def _build(r):\n    return {{{', '.join(parts)}}}\n", namespace)
+    return namespace['_build']
+
 
 class ZeppAnalyzer:
     """Analyze Zepp U tennis data."""
@@ -31,6 +125,60 @@ class ZeppAnalyzer:
         """
         self.db_path = db_path
 
+        # Per-shape row builders, compiled once per analyzer instance
+        self._build_stroke_row = _compile_row_builder([
+            ('stroke_type', None, None),
+            ('total_shots', None, None),
+            ('shots_with_velocity', None, None),
+            ('avg_racket_speed_mph', 2, None),
+            ('max_racket_speed_mph', 2, None),
+            ('avg_power', 3, None),
+            ('avg_consistency', 3, None),
+        ])
+        # Trend rows share (month, value) but the context column's name
+        # depends on the metric, so one builder per shape
+        self._build_trend_row = {
+            field: _compile_row_builder([
+                ('month', None, None),
+                ('value', 2, 0),
+                (field, None, None),
+            ])
+            for field in ('total_shots', 'session_count', 'shots_with_speed')
+        }
+
+        # Result cache: analyzer queries are deterministic over slowly
+        # changing historical data, so results are memoized keyed on the
+        # database file's (mtime, size) version and dropped when it changes
+        self._cache: Dict[tuple, Any] = {}
+        self._cache_version: Optional[tuple] = None
+
+    def _db_version(self) -> tuple:
+        stat = self.db_path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+        # Under WAL, commits land in the -wal file and leave the main
+        # database file untouched until a checkpoint, so the WAL's stat
+        # must be part of the version or a long-lived analyzer keeps
+        # serving stale results while the server connection is open
+        try:
+            wal_stat = self.db_path.with_name(self.db_path.name + '-wal').stat()
+            version += (wal_stat.st_mtime_ns, wal_stat.st_size)
+        except FileNotFoundError:
+            pass
+        return version
+
+    def _cached(self, key: tuple, compute):
+        """Return a memoized result, recomputing when the database changes."""
+        if self._db_version() != self._cache_version:
+            self._cache.clear()
+
+        if key not in self._cache:
+            self._cache[key] = compute()
+            # connect() may itself write (index creation, rollup backfill,
+            # planner stats), so snapshot the version after computing or the
+            # cache would invalidate itself on every call
+            self._cache_version = self._db_version()
+        return self._cache[key]
+
     def connect(self) -> sqlite3.Connection:
         """Connect to database."""
         if not self.db_path.exists():
@@ -38,6 +186,36 @@ class ZeppAnalyzer:
 
         conn = sqlite3.connect(str(self.db_path))
         conn.row_factory = sqlite3.Row
+
+        # Covering indexes for the analyzer's hot predicates: the shots
+        # aggregates read only (session_id, shot_type, speed_mph) and the
+        # session filters only (device, date), so both run off index pages
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_shots_session_type_speed
+            ON shots(session_id, shot_type, speed_mph)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_sessions_device_date
+            ON sessions(device, date)
+        """)
+        # The old idx_shots_speed_positive partial index is dead weight now
+        # that no query filters with a plain WHERE speed_mph > 0 (the
+        # remaining speed predicates live inside CASE aggregates, and reads
+        # come from the zepp_session_stats rollup) - drop it so it stops
+        # taxing every live shot insert
+        conn.execute("DROP INDEX IF EXISTS idx_shots_speed_positive")
+        # Refresh planner statistics cheaply so the new indexes get picked
+        conn.execute("PRAGMA analysis_limit=400")
+        conn.execute("PRAGMA optimize")
+
+        # Ensure the stats rollup (table + maintenance trigger) exists;
+        # backfill once for databases imported before the rollup existed
+        conn.executescript(_SQL_ROLLUP_TABLE)
+        populated = conn.execute(
+            "SELECT EXISTS(SELECT 1 FROM zepp_session_stats)").fetchone()[0]
+        if not populated:
+            conn.execute(_SQL_ROLLUP_BACKFILL)
+            conn.commit()
         return conn
 
     def get_date_range(self) -> Tuple[str, str]:
@@ -58,56 +236,56 @@ class ZeppAnalyzer:
 
     def get_total_stats(self) -> Dict[str, Any]:
         """Get overall statistics across all Zepp sessions."""
+        return self._cached(('total_stats',), self._get_total_stats)
+
+    def _get_total_stats(self) -> Dict[str, Any]:
         conn = self.connect()
         cursor = conn.cursor()
 
-        # Session stats
-        cursor.execute("""
-            SELECT
-                COUNT(*) as total_sessions,
-                SUM(shot_count) as total_shots,
-                SUM(duration_minutes) as total_minutes,
-                MIN(date) as earliest_date,
-                MAX(date) as latest_date
-            FROM sessions
-            WHERE device = 'ZeppU'
-        """)
-
-        session_row = cursor.fetchone()
-
-        # Shot type distribution
-        cursor.execute("""
-            SELECT shot_type, COUNT(*) as count
-            FROM shots
-            WHERE session_id LIKE 'zepp_%'
-            GROUP BY shot_type
-        """)
-
-        shot_types = {row['shot_type']: row['count'] for row in cursor.fetchall()}
-
-        # Velocity stats (only for shots with velocity > 0)
+        # One statement instead of three round-trips: each source is scanned
+        # once in a CTE and json_group_object packs the per-stroke histogram
+        # into a single column
         cursor.execute("""
+            WITH z_sessions AS (
+                SELECT shot_count, duration_minutes, date
+                FROM sessions
+                WHERE device = 'ZeppU'
+            ),
+            z_stats AS (
+                SELECT
+                    shot_type,
+                    SUM(shot_count) as count,
+                    SUM(shots_with_speed) as shots_with_speed,
+                    SUM(speed_sum) as speed_sum,
+                    MAX(max_speed) as max_speed
+                FROM zepp_session_stats
+                GROUP BY shot_type
+            )
             SELECT
-                COUNT(CASE WHEN speed_mph > 0 THEN 1 END) as shots_with_speed,
-                AVG(CASE WHEN speed_mph > 0 THEN speed_mph END) as avg_speed,
-                MAX(speed_mph) as max_speed
-            FROM shots
-            WHERE session_id LIKE 'zepp_%'
+                (SELECT COUNT(*) FROM z_sessions) as total_sessions,
+                (SELECT SUM(shot_count) FROM z_sessions) as total_shots,
+                (SELECT SUM(duration_minutes) FROM z_sessions) as total_minutes,
+                (SELECT MIN(date) FROM z_sessions) as earliest_date,
+                (SELECT MAX(date) FROM z_sessions) as latest_date,
+                (SELECT json_group_object(shot_type, count) FROM z_stats) as shot_types,
+                (SELECT SUM(shots_with_speed) FROM z_stats) as shots_with_speed,
+                (SELECT SUM(speed_sum) / NULLIF(SUM(shots_with_speed), 0)
+                 FROM z_stats) as avg_speed,
+                (SELECT MAX(max_speed) FROM z_stats) as max_speed
         """)
 
-        velocity_row = cursor.fetchone()
-
+        row = cursor.fetchone()
         conn.close()
 
         return {
-            'total_sessions': session_row['total_sessions'],
-            'total_shots': session_row['total_shots'],
-            'total_minutes': session_row['total_minutes'],
-            'date_range': f"{session_row['earliest_date']} to {session_row['latest_date']}",
-            'shot_types': shot_types,
-            'shots_with_velocity': velocity_row['shots_with_speed'],
-            'avg_racket_speed_mph': round(velocity_row['avg_speed'], 2) if velocity_row['avg_speed'] else 0,
-            'max_racket_speed_mph': round(velocity_row['max_speed'], 2) if velocity_row['max_speed'] else 0
+            'total_sessions': row['total_sessions'],
+            'total_shots': row['total_shots'],
+            'total_minutes': row['total_minutes'],
+            'date_range': f"{row['earliest_date']} to {row['latest_date']}",
+            'shot_types': json.loads(row['shot_types']) if row['shot_types'] else {},
+            'shots_with_velocity': row['shots_with_speed'],
+            'avg_racket_speed_mph': round(row['avg_speed'], 2) if row['avg_speed'] else 0,
+            'max_racket_speed_mph': round(row['max_speed'], 2) if row['max_speed'] else 0
         }
 
     def analyze_stroke_performance(self, stroke_type: Optional[str] = None) -> Dict[str, Any]:
@@ -121,45 +299,46 @@ class ZeppAnalyzer:
         Returns:
             Dict with performance metrics
         """
+        return self._cached(
+            ('stroke_performance', stroke_type),
+            lambda: self._analyze_stroke_performance(stroke_type)
+        )
+
+    def _analyze_stroke_performance(self, stroke_type: Optional[str]) -> Dict[str, Any]:
         conn = self.connect()
         cursor = conn.cursor()
 
-        # Build query
-        where_clause = "session_id LIKE 'zepp_%'"
+        # Build query (aggregating the per-session rollup)
+        where_clause = "1=1"
         params = []
 
         if stroke_type:
-            where_clause += " AND shot_type = ?"
+            where_clause = "shot_type = ?"
             params.append(stroke_type)
 
         query = f"""
             SELECT
                 shot_type,
-                COUNT(*) as total_shots,
-                COUNT(CASE WHEN speed_mph > 0 THEN 1 END) as shots_with_speed,
-                AVG(CASE WHEN speed_mph > 0 THEN speed_mph END) as avg_speed,
-                MAX(speed_mph) as max_speed,
-                AVG(power) as avg_power,
-                AVG(consistency) as avg_consistency
-            FROM shots
+                SUM(shot_count) as total_shots,
+                SUM(shots_with_speed) as shots_with_speed,
+                SUM(speed_sum) / NULLIF(SUM(shots_with_speed), 0) as avg_speed,
+                MAX(max_speed) as max_speed,
+                SUM(power_sum) / NULLIF(SUM(shot_count), 0) as avg_power,
+                SUM(consistency_sum) / NULLIF(SUM(shot_count), 0) as avg_consistency
+            FROM zepp_session_stats
             WHERE {where_clause}
             GROUP BY shot_type
             ORDER BY total_shots DESC
         """
 
+        # Plain tuples + unpacking: every sqlite3.Row[name] access does a
+        # column-name lookup, which adds up over larger result sets
+        cursor.row_factory = None
+        cursor.arraysize = 1000
         cursor.execute(query, params)
 
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                'stroke_type': row['shot_type'],
-                'total_shots': row['total_shots'],
-                'shots_with_velocity': row['shots_with_speed'],
-                'avg_racket_speed_mph': round(row['avg_speed'], 2) if row['avg_speed'] else None,
-                'max_racket_speed_mph': round(row['max_speed'], 2) if row['max_speed'] else None,
-                'avg_power': round(row['avg_power'], 3) if row['avg_power'] else None,
-                'avg_consistency': round(row['avg_consistency'], 3) if row['avg_consistency'] else None
-            })
+        build = self._build_stroke_row
+        results = [build(row) for row in cursor.fetchall()]
 
         conn.close()
 
@@ -168,16 +347,37 @@ class ZeppAnalyzer:
             'filtered_by': stroke_type if stroke_type else 'all_strokes'
         }
 
-    def analyze_monthly_trends(self, metric: str = 'shot_count') -> List[Dict[str, Any]]:
+    def analyze_monthly_trends(self, metric: str = 'shot_count') -> Iterator[Dict[str, Any]]:
         """
         Analyze monthly trends for a metric.
 
         Args:
             metric: Metric to track ('shot_count', 'avg_speed', 'sessions')
 
-        Returns:
-            List of monthly data points
+        Yields:
+            Monthly data points, oldest first. Rows stream straight from the
+            cursor so the CLI prints as results arrive; a fully consumed run
+            is memoized like the other analyzer methods.
         """
+        key = ('monthly_trends', metric)
+        if self._db_version() != self._cache_version:
+            self._cache.clear()
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            yield from cached
+            return
+
+        rows: List[Dict[str, Any]] = []
+        for row in self._analyze_monthly_trends(metric):
+            rows.append(row)
+            yield row
+
+        # Only a run consumed to the end is a complete result worth caching
+        self._cache[key] = rows
+        self._cache_version = self._db_version()
+
+    def _analyze_monthly_trends(self, metric: str) -> Iterator[Dict[str, Any]]:
         conn = self.connect()
         cursor = conn.cursor()
 
@@ -207,10 +407,10 @@ class ZeppAnalyzer:
             query = """
                 SELECT
                     strftime('%Y-%m', s.date) as month,
-                    AVG(CASE WHEN sh.speed_mph > 0 THEN sh.speed_mph END) as value,
-                    COUNT(CASE WHEN sh.speed_mph > 0 THEN 1 END) as shots_with_speed
+                    SUM(z.speed_sum) / NULLIF(SUM(z.shots_with_speed), 0) as value,
+                    SUM(z.shots_with_speed) as shots_with_speed
                 FROM sessions s
-                JOIN shots sh ON s.session_id = sh.session_id
+                JOIN zepp_session_stats z ON s.session_id = z.session_id
                 WHERE s.device = 'ZeppU'
                 GROUP BY month
                 ORDER BY month ASC
@@ -218,35 +418,36 @@ class ZeppAnalyzer:
         else:
             raise ValueError(f"Unknown metric: {metric}")
 
-        cursor.execute(query)
-
-        results = []
-        for row in cursor.fetchall():
-            data_point = {
-                'month': row['month'],
-                'value': round(row['value'], 2) if row['value'] else 0
-            }
-
-            # Add context fields
-            if metric == 'sessions':
-                data_point['total_shots'] = row['total_shots']
-            elif metric == 'shot_count':
-                data_point['session_count'] = row['session_count']
-            elif metric == 'avg_speed':
-                data_point['shots_with_speed'] = row['shots_with_speed']
-
-            results.append(data_point)
-
-        conn.close()
-
-        return results
+        # Each query selects (month, value, context); only the context
+        # field's name varies by metric
+        context_field = {
+            'sessions': 'total_shots',
+            'shot_count': 'session_count',
+            'avg_speed': 'shots_with_speed'
+        }[metric]
+
+        cursor.row_factory = None
+        cursor.arraysize = 1000
+
+        build = self._build_trend_row[context_field]
+        try:
+            for row in cursor.execute(query):
+                yield build(row)
+        finally:
+            conn.close()
 
-    def get_session_details(self, session_id: str) -> Dict[str, Any]:
+    def get_session_details(self, session_id: str,
+                            parse_json: bool = True) -> Dict[str, Any]:
         """
         Get detailed information about a specific session.
 
         Args:
             session_id: Session identifier (e.g., 'zepp_20251103')
+            parse_json: Decode data_json / the session report into dicts.
+                        Pass False when only the summary fields are needed:
+                        the data_json blob then never leaves SQLite (scalar
+                        fields are projected with json_extract) and the
+                        report is returned as its raw string.
 
         Returns:
             Dict with session details
@@ -254,12 +455,23 @@ class ZeppAnalyzer:
         conn = self.connect()
         cursor = conn.cursor()
 
-        # Session metadata
-        cursor.execute("""
-            SELECT *
-            FROM sessions
-            WHERE session_id = ?
-        """, (session_id,))
+        # Session metadata. In summary mode json_extract projects the only
+        # metadata scalar we surface, so the full blob is never read out.
+        if parse_json:
+            cursor.execute("""
+                SELECT *
+                FROM sessions
+                WHERE session_id = ?
+            """, (session_id,))
+        else:
+            cursor.execute("""
+                SELECT
+                    session_id, device, date, start_time, end_time,
+                    duration_minutes, shot_count,
+                    json_extract(data_json, '$.source') as source
+                FROM sessions
+                WHERE session_id = ?
+            """, (session_id,))
 
         session = cursor.fetchone()
         if not session:
@@ -267,18 +479,19 @@ class ZeppAnalyzer:
             raise ValueError(f"Session not found: {session_id}")
 
         session_data = dict(session)
-        session_data['data_json'] = json.loads(session_data['data_json'])
+        if parse_json:
+            session_data['data_json'] = _json_loads(session_data['data_json'])
 
-        # Shot breakdown
+        # Shot breakdown (straight from the per-session rollup - the last
+        # CASE-based aggregate over the shots table)
         cursor.execute("""
             SELECT
                 shot_type,
-                COUNT(*) as count,
-                AVG(CASE WHEN speed_mph > 0 THEN speed_mph END) as avg_speed,
-                MAX(speed_mph) as max_speed
-            FROM shots
+                shot_count as count,
+                speed_sum / NULLIF(shots_with_speed, 0) as avg_speed,
+                max_speed
+            FROM zepp_session_stats
             WHERE session_id = ?
-            GROUP BY shot_type
         """, (session_id,))
 
         shot_breakdown = [
@@ -300,7 +513,11 @@ class ZeppAnalyzer:
         """, (session_id,))
 
         report_row = cursor.fetchone()
-        session_report = json.loads(report_row['values_json']) if report_row else None
+        if report_row:
+            session_report = (_json_loads(report_row['values_json'])
+                              if parse_json else report_row['values_json'])
+        else:
+            session_report = None
 
         conn.close()
 
@@ -328,8 +545,7 @@ class ZeppAnalyzer:
             order_by = metric
             query = f"""
                 SELECT
-                    session_id, date, shot_count, duration_minutes,
-                    data_json
+                    session_id, date, shot_count, duration_minutes
                 FROM sessions
                 WHERE device = 'ZeppU'
                 ORDER BY {order_by} DESC
@@ -341,9 +557,9 @@ class ZeppAnalyzer:
             query = """
                 SELECT
                     s.session_id, s.date, s.shot_count, s.duration_minutes,
-                    AVG(CASE WHEN sh.speed_mph > 0 THEN sh.speed_mph END) as avg_speed
+                    SUM(z.speed_sum) / NULLIF(SUM(z.shots_with_speed), 0) as avg_speed
                 FROM sessions s
-                JOIN shots sh ON s.session_id = sh.session_id
+                JOIN zepp_session_stats z ON s.session_id = z.session_id
                 WHERE s.device = 'ZeppU'
                 GROUP BY s.session_id
                 ORDER BY avg_speed DESC
@@ -391,47 +607,67 @@ class ZeppAnalyzer:
         Returns:
             Dict comparing the two periods
         """
+        return self._cached(
+            ('compare_periods', period1_start, period1_end, period2_start, period2_end),
+            lambda: self._compare_time_periods(
+                period1_start, period1_end, period2_start, period2_end)
+        )
+
+    def _compare_time_periods(
+        self,
+        period1_start: str,
+        period1_end: str,
+        period2_start: str,
+        period2_end: str
+    ) -> Dict[str, Any]:
         conn = self.connect()
         cursor = conn.cursor()
+        cursor.row_factory = None
 
-        def get_period_stats(start_date: str, end_date: str) -> Dict:
-            cursor.execute("""
-                SELECT
-                    COUNT(*) as sessions,
-                    SUM(shot_count) as total_shots,
-                    SUM(duration_minutes) as total_minutes
-                FROM sessions
-                WHERE device = 'ZeppU'
-                  AND date >= ? AND date <= ?
-            """, (start_date, end_date))
-
-            session_stats = cursor.fetchone()
+        # One scan instead of two queries per period: pull every session's
+        # totals from the rollup once, then bucket sessions into the
+        # requested periods in a single Python pass
+        cursor.execute("""
+            SELECT
+                s.date, s.shot_count, s.duration_minutes,
+                COALESCE(SUM(z.speed_sum), 0),
+                COALESCE(SUM(z.shots_with_speed), 0),
+                COALESCE(MAX(z.max_speed), 0)
+            FROM sessions s
+            LEFT JOIN zepp_session_stats z ON s.session_id = z.session_id
+            WHERE s.device = 'ZeppU'
+            GROUP BY s.session_id
+        """)
+        session_rows = cursor.fetchall()
 
-            cursor.execute("""
-                SELECT
-                    AVG(CASE WHEN sh.speed_mph > 0 THEN sh.speed_mph END) as avg_speed,
-                    MAX(sh.speed_mph) as max_speed
-                FROM sessions s
-                JOIN shots sh ON s.session_id = sh.session_id
-                WHERE s.device = 'ZeppU'
-                  AND s.date >= ? AND s.date <= ?
-            """, (start_date, end_date))
+        conn.close()
 
-            velocity_stats = cursor.fetchone()
+        def get_period_stats(start_date: str, end_date: str) -> Dict:
+            sessions = total_shots = total_minutes = 0
+            speed_sum = 0.0
+            speed_count = 0
+            max_speed = 0.0
+
+            for date, shot_count, duration, s_sum, s_count, s_max in session_rows:
+                if start_date <= date <= end_date:
+                    sessions += 1
+                    total_shots += shot_count or 0
+                    total_minutes += duration or 0
+                    speed_sum += s_sum
+                    speed_count += s_count
+                    max_speed = max(max_speed, s_max)
 
             return {
-                'sessions': session_stats['sessions'],
-                'total_shots': session_stats['total_shots'],
-                'total_minutes': session_stats['total_minutes'],
-                'avg_speed_mph': round(velocity_stats['avg_speed'], 2) if velocity_stats['avg_speed'] else None,
-                'max_speed_mph': round(velocity_stats['max_speed'], 2) if velocity_stats['max_speed'] else None
+                'sessions': sessions,
+                'total_shots': total_shots if sessions else None,
+                'total_minutes': total_minutes if sessions else None,
+                'avg_speed_mph': round(speed_sum / speed_count, 2) if speed_count else None,
+                'max_speed_mph': round(max_speed, 2) if max_speed else None
             }
 
         period1 = get_period_stats(period1_start, period1_end)
         period2 = get_period_stats(period2_start, period2_end)
 
-        conn.close()
-
         # Calculate changes
         changes = {}
         for key in ['sessions', 'total_shots', 'total_minutes', 'avg_speed_mph', 'max_speed_mph']:
@@ -455,8 +691,37 @@ class ZeppAnalyzer:
         }
 
 
+# Specialized printers for flat dicts, exec-compiled per (key tuple, indent)
+# shape the first time it is seen. The CLI prints the same shapes (trend rows,
+# stroke rows, top sessions) hundreds of times, and the compiled body is
+# straight-line prints with the prefixes baked in — no per-key isinstance
+# dispatch after the first call.
+_flat_printers: Dict[tuple, Any] = {}
+
+
+def _compile_flat_printer(keys: tuple, indent: int):
+    prefix = "  " * indent
+    # 'pass' keeps the generated function valid for empty dicts (e.g. a
+    # missing session_report or shot_types on an empty database)
+    lines = ["def _p(d):", "    pass"]
+    for key in keys:
+        lines.append(f"    print({prefix + key + ': '!r} + str(d[{key!r}]))")
+    namespace: Dict[str, Any] = {}
+    exec("\n".join(lines) + "\n", namespace)
+    return namespace['_p']
+
+
 def print_dict(data: Dict, indent: int = 0):
     """Pretty print dictionary."""
+    values = data.values()
+    if not any(isinstance(v, (dict, list)) for v in values):
+        shape = (tuple(data.keys()), indent)
+        printer = _flat_printers.get(shape)
+        if printer is None:
+            printer = _flat_printers[shape] = _compile_flat_printer(*shape)
+        printer(data)
+        return
+
     prefix = "  " * indent
     for key, value in data.items():
         if isinstance(value, dict):
@@ -12,15 +12,138 @@ Imports swings from ztennis.db into the TennisAgent database:
 import sqlite3
 import sys
 import json
-import uuid
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
-from collections import defaultdict
+from typing import Dict, Any
 
 # Add parent directory for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# orjson serializes the per-shot payloads several times faster than the
+# stdlib encoder; fall back silently when it is not installed
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+
+# Module-level SQL constants: sqlite3 caches prepared statements keyed by the
+# exact SQL text, so binding against the same string keeps the cache hot
+# across the whole import instead of re-preparing per call
+_SQL_INSERT_SESSION = """
+    INSERT OR REPLACE INTO sessions (
+        session_id, device, date,
+        start_time, end_time, duration_minutes,
+        shot_count, data_json
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_SHOT = """
+    INSERT OR REPLACE INTO shots (
+        shot_id, session_id, timestamp, sequence_number,
+        rotation_magnitude, acceleration_magnitude,
+        shot_type, spin_type, speed_mph,
+        power, consistency, data_json
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_CALC_METRIC = """
+    INSERT OR REPLACE INTO calculated_metrics (
+        calc_id, session_id, metric_type, values_json
+    ) VALUES (?, ?, ?, ?)
+"""
+
+# Materialized per-session/per-stroke rollup. The analyzer aggregates over
+# this table (O(#sessions) rows) instead of re-scanning every shot. The
+# trigger keeps it current for incremental inserts; re-imports (which use
+# INSERT OR REPLACE) rebuild it from scratch afterwards.
+_SQL_ROLLUP_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS zepp_session_stats (
+        session_id TEXT NOT NULL,
+        shot_type TEXT NOT NULL,
+        shot_count INTEGER NOT NULL DEFAULT 0,
+        shots_with_speed INTEGER NOT NULL DEFAULT 0,
+        speed_sum REAL NOT NULL DEFAULT 0,
+        max_speed REAL NOT NULL DEFAULT 0,
+        power_sum REAL NOT NULL DEFAULT 0,
+        consistency_sum REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (session_id, shot_type)
+    );
+
+    CREATE TRIGGER IF NOT EXISTS trg_zepp_session_stats
+    AFTER INSERT ON shots
+    WHEN NEW.session_id LIKE 'zepp_%'
+    BEGIN
+        INSERT INTO zepp_session_stats (
+            session_id, shot_type, shot_count, shots_with_speed,
+            speed_sum, max_speed, power_sum, consistency_sum
+        ) VALUES (
+            NEW.session_id, NEW.shot_type, 1,
+            CASE WHEN NEW.speed_mph > 0 THEN 1 ELSE 0 END,
+            CASE WHEN NEW.speed_mph > 0 THEN NEW.speed_mph ELSE 0 END,
+            COALESCE(NEW.speed_mph, 0),
+            COALESCE(NEW.power, 0),
+            COALESCE(NEW.consistency, 0)
+        )
+        ON CONFLICT(session_id, shot_type) DO UPDATE SET
+            shot_count = shot_count + 1,
+            shots_with_speed = shots_with_speed
+                + CASE WHEN NEW.speed_mph > 0 THEN 1 ELSE 0 END,
+            speed_sum = speed_sum
+                + CASE WHEN NEW.speed_mph > 0 THEN NEW.speed_mph ELSE 0 END,
+            max_speed = MAX(max_speed, COALESCE(NEW.speed_mph, 0)),
+            power_sum = power_sum + COALESCE(NEW.power, 0),
+            consistency_sum = consistency_sum + COALESCE(NEW.consistency, 0);
+    END;
+"""
+
+# Per-session aggregates computed by SQLite in one native pass over the
+# source btree. 'localtime' matches datetime.fromtimestamp(), which the
+# row-level session bucketing uses. AVG over a CASE ignores the NULLs it
+# produces, giving the same zero-excluding averages as before.
+_SQL_ZEPP_SESSION_AGG = """
+    SELECT
+        strftime('%Y%m%d', client_created / 1000, 'unixepoch', 'localtime') AS sid,
+        MIN(client_created) AS start_ms,
+        MAX(client_created) AS end_ms,
+        COUNT(*) AS n,
+        AVG(CASE WHEN impact_vel > 0 THEN impact_vel END) AS avg_impact_vel,
+        AVG(CASE WHEN ball_vel > 0 THEN ball_vel END) AS avg_ball_vel,
+        AVG(CASE WHEN spin > 0 THEN spin END) AS avg_spin,
+        AVG(COALESCE(NULLIF(score, 0), 60)) AS avg_score
+    FROM swings
+    GROUP BY sid
+"""
+
+_SQL_ROLLUP_REBUILD = """
+    INSERT INTO zepp_session_stats (
+        session_id, shot_type, shot_count, shots_with_speed,
+        speed_sum, max_speed, power_sum, consistency_sum
+    )
+    SELECT
+        session_id,
+        shot_type,
+        COUNT(*),
+        COUNT(CASE WHEN speed_mph > 0 THEN 1 END),
+        COALESCE(SUM(CASE WHEN speed_mph > 0 THEN speed_mph END), 0),
+        COALESCE(MAX(speed_mph), 0),
+        COALESCE(SUM(power), 0),
+        COALESCE(SUM(consistency), 0)
+    FROM shots
+    -- range predicate instead of LIKE 'zepp_%' so the session_id index is
+    -- usable ('`' is the character after '_', closing the prefix range)
+    WHERE session_id >= 'zepp_' AND session_id < 'zepp`'
+    GROUP BY session_id, shot_type
+"""
+
 
 class ZeppImporter:
     """Import Zepp U tennis data into TennisAgent database."""
@@ -42,6 +165,54 @@ class ZeppImporter:
         1: 'backhand_side'
     }
 
+    # Streaming SELECT with the per-row derivations pushed into SQL: the
+    # type/side mapping, spin classification and NULL-coalescing all run in
+    # the SQLite engine instead of per-row Python. The CASE arms are
+    # generated from the maps above so there is one source of truth.
+    _SQL_STREAM_SWINGS = """
+        SELECT
+            _id,
+            client_created,
+            CASE swing_type {type_arms} ELSE 'unknown' END AS shot_type,
+            CASE WHEN spin > 5 THEN 'topspin'
+                 WHEN spin < -5 THEN 'slice'
+                 ELSE 'flat' END AS spin_type,
+            CASE swing_side {side_arms} ELSE 'unknown' END AS swing_side,
+            COALESCE(impact_vel, 0) AS impact_vel,
+            COALESCE(ball_vel, 0) AS ball_vel,
+            COALESCE(spin, 0) AS spin,
+            COALESCE(ball_spin, 0) AS ball_spin,
+            COALESCE(upswing_time, 0) AS upswing_time,
+            COALESCE(impact_time, 0) AS impact_time,
+            COALESCE(backswing_time, 0) AS backswing_time,
+            COALESCE(impact_position_x, 0) AS impact_position_x,
+            COALESCE(impact_position_y, 0) AS impact_position_y,
+            COALESCE(impact_region, 0) AS impact_region,
+            COALESCE(NULLIF(score, 0), 60) AS score,
+            COALESCE(power, 0) AS power
+        FROM swings
+        ORDER BY client_created ASC
+    """.format(
+        type_arms=' '.join(f"WHEN {code} THEN '{name}'"
+                           for code, name in SWING_TYPE_MAP.items()),
+        side_arms=' '.join(f"WHEN {code} THEN '{name}'"
+                           for code, name in SWING_SIDE_MAP.items())
+    )
+
+    # All per-session shot-type counts in one engine-side pass, replacing
+    # the per-row counter updates in the streaming loop
+    _SQL_ZEPP_TYPE_COUNTS = """
+        SELECT
+            strftime('%Y%m%d', client_created / 1000, 'unixepoch', 'localtime') AS sid,
+            CASE swing_type {type_arms} ELSE 'unknown' END AS shot_type,
+            COUNT(*) AS n
+        FROM swings
+        GROUP BY sid, shot_type
+    """.format(
+        type_arms=' '.join(f"WHEN {code} THEN '{name}'"
+                           for code, name in SWING_TYPE_MAP.items())
+    )
+
     def __init__(self, zepp_db_path: Path, tennis_db_path: Path):
         """
         Initialize importer.
@@ -60,6 +231,25 @@ class ZeppImporter:
             'earliest_date': None,
             'latest_date': None
         }
+        # timestamp-bucket → session_id cache (see _session_id_for_ms)
+        self._session_id_cache: Dict[int, str] = {}
+
+    def _session_id_for_ms(self, timestamp_ms: int) -> str:
+        """
+        Date-based session_id for a millisecond timestamp.
+
+        datetime.fromtimestamp + strftime per row is the bulk of the
+        remaining Python work in the swing stream, so the result is cached
+        per 15-minute bucket: real-world UTC offsets are all multiples of
+        15 minutes, so a bucket can never straddle a local midnight, and a
+        year of data needs at most ~35k cheap dict hits per million rows.
+        """
+        bucket = timestamp_ms // 900_000
+        session_id = self._session_id_cache.get(bucket)
+        if session_id is None:
+            session_id = f"zepp_{datetime.fromtimestamp(timestamp_ms / 1000.0).strftime('%Y%m%d')}"
+            self._session_id_cache[bucket] = session_id
+        return session_id
 
     def connect_zepp_db(self) -> sqlite3.Connection:
         """Connect to Zepp database."""
@@ -75,8 +265,23 @@ class ZeppImporter:
         if not self.tennis_db_path.exists():
             raise FileNotFoundError(f"Tennis database not found: {self.tennis_db_path}")
 
-        conn = sqlite3.connect(str(self.tennis_db_path))
+        # check_same_thread=False: import_swings hands completed batches to
+        # a single writer thread; accesses never overlap (each write is
+        # awaited before the next is submitted)
+        conn = sqlite3.connect(str(self.tennis_db_path), check_same_thread=False)
         conn.row_factory = sqlite3.Row
+
+        # Import is write-heavy and re-runnable from the source database, so
+        # synchronous=OFF is acceptable here: a crash mid-import just means
+        # re-running the script. journal_mode stays WAL (it is persistent on
+        # the database file and the server expects it).
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA temp_store=MEMORY")
+
+        # Make sure the stats rollup (table + maintenance trigger) exists
+        conn.executescript(_SQL_ROLLUP_SCHEMA)
         return conn
 
     def register_device(self, conn: sqlite3.Connection):
@@ -105,222 +310,190 @@ class ZeppImporter:
             'zepp_u_001',
             'ZeppU',
             'Zepp Tennis Sensor',
-            json.dumps(device_metadata)
+            _json_dumps(device_metadata)
         ))
-        conn.commit()
 
         print("✅ Registered Zepp U device")
 
-    def import_swings(self, zepp_conn: sqlite3.Connection, tennis_conn: sqlite3.Connection) -> Dict[str, List[Dict]]:
+    def import_swings(self, zepp_conn: sqlite3.Connection, tennis_conn: sqlite3.Connection) -> Dict[str, Dict[str, Any]]:
         """
-        Import swings from Zepp database.
+        Stream swings from the Zepp database straight into the shots table.
+
+        Rows are pulled in fetchmany batches and each batch is written with
+        one executemany call in the same pass, so peak memory is one batch
+        of shot rows plus a small per-session aggregate record - not the
+        whole swing history. Time bounds, counts and metric averages are
+        computed up front by a single source-side GROUP BY; the Python loop
+        only tracks sequence numbers and shot-type counts.
 
         Returns:
-            Dict mapping session_id to list of swing data
+            Dict mapping session_id to its aggregate record
         """
-        print("\n📊 Reading swings from Zepp database...")
+        print("\n📊 Streaming swings from Zepp database...")
 
         zepp_cursor = zepp_conn.cursor()
-        zepp_cursor.execute("""
-            SELECT
-                _id,
-                client_created,
-                year, month, day,
-                swing_type, swing_side,
-                impact_vel, ball_vel, spin, ball_spin,
-                upswing_time, impact_time, backswing_time,
-                impact_position_x, impact_position_y,
-                impact_region, score,
-                power, racket_speed
-            FROM swings
-            ORDER BY client_created ASC
-        """)
-
-        # Group swings by date (session)
-        sessions_data = defaultdict(list)
-
-        for row in zepp_cursor.fetchall():
-            self.stats['swings_read'] += 1
-
-            # Parse timestamp (client_created is Unix milliseconds)
-            timestamp_ms = row['client_created']
-            timestamp_dt = datetime.fromtimestamp(timestamp_ms / 1000.0)
-
-            # Create session_id based on date
-            session_date = timestamp_dt.strftime('%Y%m%d')
-            session_id = f"zepp_{session_date}"
-
-            # Track date range
-            date_str = timestamp_dt.strftime('%Y-%m-%d')
-            if self.stats['earliest_date'] is None or date_str < self.stats['earliest_date']:
-                self.stats['earliest_date'] = date_str
-            if self.stats['latest_date'] is None or date_str > self.stats['latest_date']:
-                self.stats['latest_date'] = date_str
-
-            # Map swing type
-            swing_type_code = row['swing_type']
-            shot_type = self.SWING_TYPE_MAP.get(swing_type_code, 'unknown')
-
-            # Determine spin type based on spin value
-            spin_val = row['spin'] or 0
-            if spin_val > 5:
-                spin_type = 'topspin'
-            elif spin_val < -5:
-                spin_type = 'slice'
-            else:
-                spin_type = 'flat'
-
-            # Create swing data
-            swing_data = {
-                '_id': row['_id'],
-                'timestamp_ms': timestamp_ms,
-                'timestamp_dt': timestamp_dt,
-                'shot_type': shot_type,
-                'swing_side': self.SWING_SIDE_MAP.get(row['swing_side'], 'unknown'),
-                'spin_type': spin_type,
-
-                # Zepp-specific metrics
-                'impact_vel_mph': row['impact_vel'] or 0,  # Racket speed at impact
-                'ball_vel_mph': row['ball_vel'] or 0,      # Ball speed
-                'spin_rpm': row['spin'] or 0,              # Ball spin
-                'ball_spin_rpm': row['ball_spin'] or 0,    # Alternative spin field
-
-                # Timing
-                'upswing_time_sec': row['upswing_time'] or 0,
-                'impact_time_sec': row['impact_time'] or 0,
-                'backswing_time_sec': row['backswing_time'] or 0,
-
-                # Position
-                'impact_x': row['impact_position_x'] or 0,
-                'impact_y': row['impact_position_y'] or 0,
-                'impact_region': row['impact_region'] or 0,
-
-                # Quality
-                'score': row['score'] or 60,
-                'power': row['power'] or 0
-            }
-
-            sessions_data[session_id].append(swing_data)
-
-        print(f"✅ Read {self.stats['swings_read']:,} swings")
-        print(f"   Grouped into {len(sessions_data)} sessions by date")
-        print(f"   Date range: {self.stats['earliest_date']} to {self.stats['latest_date']}")
-
-        return sessions_data
-
-    def create_sessions(self, sessions_data: Dict[str, List[Dict]], tennis_conn: sqlite3.Connection):
-        """Create session records from grouped swings."""
-        print("\n📅 Creating session records...")
+        zepp_cursor.execute(self._SQL_STREAM_SWINGS)
 
         tennis_cursor = tennis_conn.cursor()
 
-        for session_id, swings in sorted(sessions_data.items()):
-            # Calculate session bounds
-            timestamps = [s['timestamp_dt'] for s in swings]
-            start_time = min(timestamps)
-            end_time = max(timestamps)
-            duration_sec = (end_time - start_time).total_seconds()
-            duration_min = max(1, int(duration_sec / 60))
-
-            # Session metadata
-            session_metadata = {
-                'source': 'zepp_u',
-                'total_swings': len(swings),
-                'shot_types': self._count_shot_types(swings),
-                'avg_racket_speed_mph': self._avg_metric(swings, 'impact_vel_mph'),
-                'avg_ball_speed_mph': self._avg_metric(swings, 'ball_vel_mph'),
-                'avg_spin_rpm': self._avg_metric(swings, 'spin_rpm'),
-                'avg_score': self._avg_metric(swings, 'score')
+        # Per-session time bounds, counts and metric averages come from one
+        # GROUP BY the SQLite engine runs natively - no per-row Python
+        # bookkeeping for them in the loop below
+        session_agg: Dict[str, Dict[str, Any]] = {}
+        for arow in zepp_conn.execute(_SQL_ZEPP_SESSION_AGG):
+            session_agg[f"zepp_{arow['sid']}"] = {
+                # shot_id prefix built once per session, not per shot
+                'shot_prefix': f"zepp_{arow['sid']}_shot_",
+                'count': arow['n'],
+                'start_ms': arow['start_ms'],
+                'end_ms': arow['end_ms'],
+                'avg_impact_vel': arow['avg_impact_vel'] or 0.0,
+                'avg_ball_vel': arow['avg_ball_vel'] or 0.0,
+                'avg_spin': arow['avg_spin'] or 0.0,
+                'avg_score': arow['avg_score'] or 0.0,
+                'seq': 0,
+                'shot_type_counts': {},
             }
 
-            # Insert session
-            tennis_cursor.execute("""
-                INSERT OR REPLACE INTO sessions (
-                    session_id, device, date,
-                    start_time, end_time, duration_minutes,
-                    shot_count, data_json
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                session_id,
-                'ZeppU',
-                start_time.strftime('%Y-%m-%d'),
-                int(start_time.timestamp()),
-                int(end_time.timestamp()),
-                duration_min,
-                len(swings),
-                json.dumps(session_metadata)
-            ))
+        for crow in zepp_conn.execute(self._SQL_ZEPP_TYPE_COUNTS):
+            session_agg[f"zepp_{crow['sid']}"]['shot_type_counts'][crow['shot_type']] = crow['n']
 
-            self.stats['sessions_created'] += 1
+        # Double-buffered write: one worker thread runs executemany on the
+        # previous batch (sqlite releases the GIL inside the C insert loop)
+        # while this thread builds the next batch's rows and JSON. Each
+        # write is awaited before the next is submitted, so only one thread
+        # touches the connection at a time.
+        writer = ThreadPoolExecutor(max_workers=1)
+        pending_write = None
 
-        tennis_conn.commit()
-        print(f"✅ Created {self.stats['sessions_created']} session records")
+        while rows := zepp_cursor.fetchmany(1000):
+            shot_rows = []
+            for row in rows:
+                # Parse timestamp (client_created is Unix milliseconds)
+                timestamp_ms = row['client_created']
 
-    def import_shots(self, sessions_data: Dict[str, List[Dict]], tennis_conn: sqlite3.Connection):
-        """Import individual shots from swings."""
-        print("\n🎾 Importing shots...")
+                # Create session_id based on date (bucket-cached)
+                session_id = self._session_id_for_ms(timestamp_ms)
 
-        tennis_cursor = tennis_conn.cursor()
+                agg = session_agg[session_id]
+
+                # Type/spin mapping and NULL handling happened in the SELECT
+                shot_type = row['shot_type']
+                spin_type = row['spin_type']
+                impact_vel = row['impact_vel']
+                score = row['score']
+                power = row['power']
 
-        for session_id, swings in sorted(sessions_data.items()):
-            for seq_num, swing in enumerate(swings, 1):
-                # Create shot_id
-                timestamp_str = swing['timestamp_dt'].strftime('%Y%m%d_%H%M%S')
-                shot_id = f"{session_id}_shot_{seq_num:03d}"
+                agg['seq'] += 1
+                seq_num = agg['seq']
 
                 # Shot data JSON (preserve all Zepp metrics)
                 shot_data = {
-                    'zepp_id': swing['_id'],
-                    'timestamp_ms': swing['timestamp_ms'],
-                    'impact_velocity_mph': swing['impact_vel_mph'],
-                    'ball_velocity_mph': swing['ball_vel_mph'],
-                    'spin_rpm': swing['spin_rpm'],
-                    'ball_spin_rpm': swing['ball_spin_rpm'],
-                    'upswing_time_sec': swing['upswing_time_sec'],
-                    'impact_time_sec': swing['impact_time_sec'],
-                    'backswing_time_sec': swing['backswing_time_sec'],
+                    'zepp_id': row['_id'],
+                    'timestamp_ms': timestamp_ms,
+                    'impact_velocity_mph': impact_vel,
+                    'ball_velocity_mph': row['ball_vel'],
+                    'spin_rpm': row['spin'],
+                    'ball_spin_rpm': row['ball_spin'],
+                    'upswing_time_sec': row['upswing_time'],
+                    'impact_time_sec': row['impact_time'],
+                    'backswing_time_sec': row['backswing_time'],
                     'impact_position': {
-                        'x': swing['impact_x'],
-                        'y': swing['impact_y']
+                        'x': row['impact_position_x'],
+                        'y': row['impact_position_y']
                     },
-                    'impact_region': swing['impact_region'],
-                    'swing_side': swing['swing_side'],
-                    'quality_score': swing['score'],
-                    'power': swing['power']
+                    'impact_region': row['impact_region'],
+                    'swing_side': row['swing_side'],
+                    'quality_score': score,
+                    'power': power
                 }
 
-                # Insert shot
                 # Note: Zepp provides racket speed, not rotation magnitude
                 # Use impact_vel as the primary speed metric
-                tennis_cursor.execute("""
-                    INSERT OR REPLACE INTO shots (
-                        shot_id, session_id, timestamp, sequence_number,
-                        rotation_magnitude, acceleration_magnitude,
-                        shot_type, spin_type, speed_mph,
-                        power, consistency, data_json
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    shot_id,
+                shot_rows.append((
+                    agg['shot_prefix'] + format(seq_num, '03d'),
                     session_id,
-                    swing['timestamp_ms'] / 1000.0,  # Convert to seconds
+                    timestamp_ms / 1000.0,  # Convert to seconds
                     seq_num,
 
                     # Zepp doesn't provide raw rotation/accel - use derived metrics
-                    swing['impact_vel_mph'] / 10.0,  # Normalized racket speed (approx rad/s equivalent)
+                    impact_vel / 10.0,  # Normalized racket speed (approx rad/s equivalent)
                     0.0,  # Acceleration magnitude not available
 
-                    swing['shot_type'],
-                    swing['spin_type'],
-                    swing['impact_vel_mph'],
-                    swing['power'] / 100.0 if swing['power'] > 0 else 0.5,  # Normalize power to 0-1
-                    swing['score'] / 100.0,  # Normalize score to 0-1
-                    json.dumps(shot_data)
+                    shot_type,
+                    spin_type,
+                    impact_vel,
+                    power / 100.0 if power > 0 else 0.5,  # Normalize power to 0-1
+                    score / 100.0,  # Normalize score to 0-1
+                    _json_dumps(shot_data)
                 ))
 
-                self.stats['swings_imported'] += 1
+            if pending_write is not None:
+                pending_write.result()
+            pending_write = writer.submit(tennis_cursor.executemany, _SQL_INSERT_SHOT, shot_rows)
+            self.stats['swings_imported'] += len(shot_rows)
+
+        if pending_write is not None:
+            pending_write.result()
+        writer.shutdown()
+
+        # Counters come from the aggregates after the stream rather than a
+        # dict increment per row
+        self.stats['swings_read'] = sum(a['count'] for a in session_agg.values())
+
+        # Date range falls out of the per-session time bounds - no need to
+        # compare strings on every row
+        if session_agg:
+            earliest_ms = min(a['start_ms'] for a in session_agg.values())
+            latest_ms = max(a['end_ms'] for a in session_agg.values())
+            self.stats['earliest_date'] = datetime.fromtimestamp(earliest_ms / 1000.0).strftime('%Y-%m-%d')
+            self.stats['latest_date'] = datetime.fromtimestamp(latest_ms / 1000.0).strftime('%Y-%m-%d')
 
-        tennis_conn.commit()
         print(f"✅ Imported {self.stats['swings_imported']:,} shots")
+        print(f"   Grouped into {len(session_agg)} sessions by date")
+        print(f"   Date range: {self.stats['earliest_date']} to {self.stats['latest_date']}")
+
+        return session_agg
+
+    def create_sessions(self, session_agg: Dict[str, Dict[str, Any]], tennis_conn: sqlite3.Connection):
+        """Create session records from the streaming pass's aggregates."""
+        print("\n📅 Creating session records...")
+
+        rows = []
+        for session_id, agg in sorted(session_agg.items()):
+            # Session bounds come straight from the running aggregates
+            start_ms = agg['start_ms']
+            end_ms = agg['end_ms']
+            duration_min = max(1, int((end_ms - start_ms) / 60000))
+
+            # Session metadata (averages computed by the source-side GROUP BY)
+            session_metadata = {
+                'source': 'zepp_u',
+                'total_swings': agg['count'],
+                'shot_types': agg['shot_type_counts'],
+                'avg_racket_speed_mph': agg['avg_impact_vel'],
+                'avg_ball_speed_mph': agg['avg_ball_vel'],
+                'avg_spin_rpm': agg['avg_spin'],
+                'avg_score': agg['avg_score']
+            }
+
+            rows.append((
+                session_id,
+                'ZeppU',
+                datetime.fromtimestamp(start_ms / 1000.0).strftime('%Y-%m-%d'),
+                int(start_ms / 1000),
+                int(end_ms / 1000),
+                duration_min,
+                agg['count'],
+                _json_dumps(session_metadata)
+            ))
+
+        # One executemany instead of per-session execute: the statement is
+        # compiled once and the whole batch stays inside the C loop
+        tennis_conn.cursor().executemany(_SQL_INSERT_SESSION, rows)
+
+        self.stats['sessions_created'] = len(rows)
+        print(f"✅ Created {self.stats['sessions_created']} session records")
 
     def import_session_reports(self, zepp_conn: sqlite3.Connection, tennis_conn: sqlite3.Connection):
         """Import session report JSON data as calculated metrics."""
@@ -338,58 +511,70 @@ class ZeppImporter:
             ORDER BY start_time ASC
         """)
 
-        tennis_cursor = tennis_conn.cursor()
-
-        for row in zepp_cursor.fetchall():
-            # Parse timestamp
-            start_dt = datetime.fromtimestamp(row['start_time'] / 1000.0)
-            session_date = start_dt.strftime('%Y%m%d')
-            session_id = f"zepp_{session_date}"
-
-            # Parse report JSON
-            try:
-                report_json = json.loads(row['report']) if row['report'] else {}
-            except json.JSONDecodeError:
-                report_json = {}
-
-            # Store as calculated metric
-            calc_id = f"calc_{uuid.uuid4().hex[:16]}"
-
-            tennis_cursor.execute("""
-                INSERT OR REPLACE INTO calculated_metrics (
-                    calc_id, session_id, metric_type, values_json
-                ) VALUES (?, ?, ?, ?)
-            """, (
-                calc_id,
-                session_id,
-                'zepp_session_report',
-                json.dumps({
-                    'zepp_session_id': row['session_id'],
-                    'zepp_server_id': row['s_id'],
-                    'game_type': row['game_type'],
-                    'active_time_sec': row['active_time'],
-                    'session_shots': row['session_shots'],
-                    'session_score': row['session_score'],
-                    'report': report_json
-                })
-            ))
-
-            self.stats['sessions_with_reports'] += 1
-
-        tennis_conn.commit()
+        # sqlite3 consumes any iterator: yield rows straight off the source
+        # cursor into executemany, with no intermediate list at all
+        def metric_rows():
+            for row in zepp_cursor:
+                # Parse timestamp (bucket-cached date → session_id)
+                session_id = self._session_id_for_ms(row['start_time'])
+
+                # The report blob is already JSON written by the Zepp app -
+                # validate it with a bare parse and splice it into the
+                # envelope as-is, skipping the re-serialize half of the old
+                # parse + dump round trip. A truncated or corrupt blob
+                # (which may still start with '{') falls back to {} like
+                # before, so the stored envelope always stays valid JSON.
+                raw_report = row['report']
+                report_field = '{}'
+                if raw_report:
+                    try:
+                        _json_loads(raw_report)
+                        report_field = raw_report
+                    except json.JSONDecodeError:
+                        pass
+
+                # Store as calculated metric. The ID is a hash of the
+                # report's identity rather than uuid4: no per-row entropy
+                # syscall, and a re-import produces the same IDs so INSERT
+                # OR REPLACE updates rows instead of piling up duplicates
+                report_key = f"{session_id}|{row['s_id']}|{row['start_time']}"
+                calc_id = f"calc_{hashlib.blake2b(report_key.encode(), digest_size=8).hexdigest()}"
+
+                yield (
+                    calc_id,
+                    session_id,
+                    'zepp_session_report',
+                    '{"zepp_session_id":%s,"zepp_server_id":%s,"game_type":%s,'
+                    '"active_time_sec":%s,"session_shots":%s,"session_score":%s,'
+                    '"report":%s}' % (
+                        _json_dumps(row['session_id']),
+                        _json_dumps(row['s_id']),
+                        _json_dumps(row['game_type']),
+                        _json_dumps(row['active_time']),
+                        _json_dumps(row['session_shots']),
+                        _json_dumps(row['session_score']),
+                        report_field
+                    )
+                )
+
+        metric_cursor = tennis_conn.cursor()
+        metric_cursor.executemany(_SQL_INSERT_CALC_METRIC, metric_rows())
+
+        # rowcount accumulates across the executemany batch
+        self.stats['sessions_with_reports'] = max(metric_cursor.rowcount, 0)
         print(f"✅ Imported {self.stats['sessions_with_reports']} session reports")
 
-    def _count_shot_types(self, swings: List[Dict]) -> Dict[str, int]:
-        """Count shots by type."""
-        counts = defaultdict(int)
-        for swing in swings:
-            counts[swing['shot_type']] += 1
-        return dict(counts)
+    def rebuild_session_stats(self, tennis_conn: sqlite3.Connection):
+        """Rebuild the zepp_session_stats rollup from the shots table."""
+        print("\n📊 Rebuilding session stats rollup...")
+
+        cursor = tennis_conn.cursor()
+        # INSERT OR REPLACE re-imports can drift the trigger-maintained
+        # counters, so recompute the rollup wholesale after a bulk import
+        cursor.execute("DELETE FROM zepp_session_stats")
+        cursor.execute(_SQL_ROLLUP_REBUILD)
 
-    def _avg_metric(self, swings: List[Dict], metric: str) -> float:
-        """Calculate average of a metric."""
-        values = [s[metric] for s in swings if s[metric] > 0]
-        return sum(values) / len(values) if values else 0.0
+        print(f"✅ Rollup rebuilt ({cursor.rowcount} session/stroke rows)")
 
     def print_summary(self):
         """Print import summary statistics."""
@@ -420,18 +605,18 @@ class ZeppImporter:
             # Step 1: Register device
             self.register_device(tennis_conn)
 
-            # Step 2: Import swings (grouped by session)
-            sessions_data = self.import_swings(zepp_conn, tennis_conn)
-
-            # Step 3: Create session records
-            self.create_sessions(sessions_data, tennis_conn)
+            # Step 2: Stream swings into shots, aggregating per session
+            session_agg = self.import_swings(zepp_conn, tennis_conn)
 
-            # Step 4: Import individual shots
-            self.import_shots(sessions_data, tennis_conn)
+            # Step 3: Create session records from the aggregates
+            self.create_sessions(session_agg, tennis_conn)
 
-            # Step 5: Import session reports
+            # Step 4: Import session reports
             self.import_session_reports(zepp_conn, tennis_conn)
 
+            # Step 5: Rebuild the analyzer's stats rollup
+            self.rebuild_session_stats(tennis_conn)
+
             # Update device stats
             tennis_cursor = tennis_conn.cursor()
             tennis_cursor.execute("""
@@ -440,6 +625,10 @@ class ZeppImporter:
                     last_seen = strftime('%s', 'now')
                 WHERE device_id = 'zepp_u_001'
             """, (self.stats['sessions_created'],))
+
+            # Single commit for the whole import: every step above rides in
+            # one transaction, so there is exactly one journal flush and a
+            # crash mid-import leaves the database untouched
             tennis_conn.commit()
 
             # Print summary
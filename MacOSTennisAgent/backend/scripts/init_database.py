@@ -8,13 +8,30 @@ import sqlite3
 from pathlib import Path
 import sys
 
+# :memory: template database built from schema.sql on first use. Repeated
+# init_database() calls in one process (test fixtures, CI) page-copy this
+# via conn.backup instead of re-running the DDL through the SQL compiler.
+_schema_template = None
 
-def init_database(db_path: Path = None):
+
+def _get_schema_template(schema_sql: str) -> sqlite3.Connection:
+    """Build (once) and return the in-memory schema template."""
+    global _schema_template
+    if _schema_template is None:
+        mem = sqlite3.connect(':memory:')
+        mem.executescript(schema_sql)
+        _schema_template = mem
+    return _schema_template
+
+
+def init_database(db_path: Path = None, verify: bool = False):
     """
     Initialize database with schema.
 
     Args:
         db_path: Path to database file. If None, uses default location.
+        verify: If True, also run COUNT(*) on each data table (slow on
+                large re-inits; skipped by default).
     """
     if db_path is None:
         # Default location
@@ -40,10 +57,28 @@ def init_database(db_path: Path = None):
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
-    # Execute schema
-    cursor.executescript(schema_sql)
+    # WAL avoids the rollback-journal fsync per DDL statement, which makes
+    # schema creation (and later bulk imports) noticeably faster. The page
+    # cache and mmap window sizes match what the server and import scripts
+    # use, so the first workload after init starts warm
+    journal_mode = cursor.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")          # 64 MB page cache
+    mmap_size = cursor.execute("PRAGMA mmap_size=268435456").fetchone()[0]
+
+    # Apply the schema by page-copying the in-memory template: backup() is
+    # a C-level copy, so re-inits skip the DDL parse entirely. CREATE IF
+    # NOT EXISTS semantics are preserved - an existing populated database
+    # is left alone rather than overwritten
+    if cursor.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0:
+        _get_schema_template(schema_sql).backup(conn)
+    else:
+        cursor.executescript(schema_sql)
     conn.commit()
 
+    print(f"   journal_mode={journal_mode}, mmap_size={mmap_size // (1024*1024)} MB")
+
     # Verify tables created
     cursor.execute("""
         SELECT name FROM sqlite_master
@@ -57,15 +92,17 @@ def init_database(db_path: Path = None):
     for table in tables:
         print(f"   - {table[0]}")
 
-    # Show table counts
-    print(f"\n📈 Current data:")
-    for table_name in ['sessions', 'shots', 'calculated_metrics', 'devices']:
-        try:
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            count = cursor.fetchone()[0]
-            print(f"   {table_name}: {count} rows")
-        except sqlite3.OperationalError:
-            pass
+    # Show table counts (only on request - COUNT(*) scans every table,
+    # which is wasted work on a fresh DB and slow on a populated re-init)
+    if verify:
+        print(f"\n📈 Current data:")
+        for table_name in ['sessions', 'shots', 'calculated_metrics', 'devices']:
+            try:
+                cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+                count = cursor.fetchone()[0]
+                print(f"   {table_name}: {count} rows")
+            except sqlite3.OperationalError:
+                pass
 
     conn.close()
 
@@ -74,12 +111,22 @@ def init_database(db_path: Path = None):
 
 
 if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Initialize the TennisAgent database")
+    parser.add_argument(
+        '--verify',
+        action='store_true',
+        help="Count rows in each table after init (slow on large databases)"
+    )
+    args = parser.parse_args()
+
     print("="*70)
     print("MacOSTennisAgent - Database Initialization")
     print("="*70)
     print()
 
-    db_path = init_database()
+    db_path = init_database(verify=args.verify)
 
     print()
     print("="*70)
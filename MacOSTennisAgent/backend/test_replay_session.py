@@ -9,9 +9,19 @@ import gzip
 import io
 import json
 import sqlite3
+import numpy as np
 import websockets
 from pathlib import Path
 
+# Optional: newer servers write zstd frames (identified by magic prefix)
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+_BIN_MAGIC = b'TWB1'  # binary buffers: uint32 count, f8 timestamps, f4 channels
+
 # Configuration
 DB_PATH = Path.home() / "Downloads/SensorDownload/Current/AppleWatch/direct_download/tennis_watch.db"
 SERVER_URL = "ws://127.0.0.1:8000/ws"
@@ -56,14 +66,44 @@ async def get_latest_session(db_path):
     # Decompress and parse all buffers
     all_samples = []
     for (compressed_data,) in buffers:
-        # Try to decompress if gzipped, otherwise use as plain text
-        try:
-            csv_data = gzip.decompress(compressed_data).decode('utf-8')
-        except (gzip.BadGzipFile, OSError):
-            # Not compressed, use directly
-            csv_data = compressed_data.decode('utf-8')
+        # Decode by codec: zstd frames carry a magic prefix, gzip rows come
+        # from older servers, anything else is raw payload
+        if zstd is not None and compressed_data[:4] == _ZSTD_MAGIC:
+            raw = zstd.ZstdDecompressor().decompress(compressed_data)
+        else:
+            try:
+                raw = gzip.decompress(compressed_data)
+            except (gzip.BadGzipFile, OSError):
+                # Not compressed, use directly
+                raw = compressed_data
+
+        # Binary buffers (newer servers): f8 timestamps + f4 channels
+        if raw[:4] == _BIN_MAGIC:
+            n = int(np.frombuffer(raw, dtype='<u4', count=1, offset=4)[0])
+            ts = np.frombuffer(raw, dtype='<f8', count=n, offset=8)
+            ch = np.frombuffer(raw, dtype='<f4', count=n * 13,
+                               offset=8 + 8 * n).reshape(n, 13)
+            for t, row in zip(ts.tolist(), ch.tolist()):
+                all_samples.append({
+                    'timestamp': t,
+                    'rotationRateX': row[0],
+                    'rotationRateY': row[1],
+                    'rotationRateZ': row[2],
+                    'accelerationX': row[3],
+                    'accelerationY': row[4],
+                    'accelerationZ': row[5],
+                    'gravityX': row[6],
+                    'gravityY': row[7],
+                    'gravityZ': row[8],
+                    'quaternionW': row[9],
+                    'quaternionX': row[10],
+                    'quaternionY': row[11],
+                    'quaternionZ': row[12]
+                })
+            continue
 
         # Parse CSV and convert to server API format
+        csv_data = raw.decode('utf-8')
         reader = csv.DictReader(io.StringIO(csv_data))
         for row in reader:
             all_samples.append({